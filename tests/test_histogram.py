@@ -42,3 +42,423 @@ class Test(unittest.TestCase):
         assert h.interval(2) == (1, 2)
         assert h.interval(3) == (2, np.inf)
         assert h.interval(-1) == h.interval(3)
+
+    def test_th1_arrays(self):
+        import pickle
+        from uproot3_methods.classes.TH1 import TH1, from_numpy
+
+        h = from_numpy((np.array([2, 3]), np.array((0., 1., 3.))))
+        assert isinstance(h, TH1) and h._classname == b"TH1I"
+        assert len(h) == 4 and list(h) == [0, 2, 3, 0] and h[1:3] == [2, 3]
+        np.testing.assert_equal(np.array(h), [0, 2, 3, 0])
+
+        assert not isinstance(h, list)
+        assert np.shares_memory(h.values, h._fArray) and np.shares_memory(h.variances, h._fSumw2)
+        assert not np.shares_memory(h._fArray, h._fSumw2)
+
+        # values and variances are writable views: changing them changes the histogram
+        v = h.values
+        v[v > 2] = 4
+        assert list(h) == [0, 2, 4, 0] and h._fArray[2] == 4
+        h.values[1] = 3
+        np.testing.assert_equal(h.values, [2, 3])
+
+        h[1] = 5
+        np.testing.assert_equal(h.values, [5, 3])
+        np.testing.assert_equal(h.variances, [2, 3])
+        np.testing.assert_equal(pickle.loads(pickle.dumps(h)).allvalues, [0, 5, 3, 0])
+        np.testing.assert_almost_equal([x["errors"][0]["symerror"]**2 for x in h.hepdata(yamloptions=None)["dependent_variables"][0]["values"]], [2, 3])
+
+    def test_shared_binning(self):
+        from uproot3_methods.classes.TH1 import from_numpy
+
+        h1 = from_numpy((np.array([1., 2.]), np.array((0., 1., 2.))))
+        h2 = from_numpy((np.array([3., 4.]), np.array((0., 1., 2.))))
+        h3 = from_numpy((np.array([3., 4.]), np.array((0., 1., 3.))))
+        assert h1.edges is h2.edges and h1.allbins is h2.allbins
+        assert h1.edges is not h3.edges
+        assert not h1.alledges.flags.writeable and not h1.bins.flags.writeable
+        np.testing.assert_equal(h3.allbins, ((-np.inf, 0), (0, 1), (1, 3), (3, np.inf)))
+
+        # a variable axis with uniform edges has the binning of the equal regular axis, so they can be added
+        import uproot3_methods.common.TH
+        h4 = from_numpy((np.array([5., 6.]), np.array((0., 1., 2.))))
+        h4._fXaxis = uproot3_methods.common.TH.TAxis(2, 0., 2., np.array([0., 1., 2.]))
+        assert h4.edges is h1.edges
+        np.testing.assert_equal((h1 + h4).values, [6, 8])
+        merged = uproot3_methods.common.TH.merge([(b"h", h1), (b"h", h4)])
+        assert len(merged[b"h"]) == 1
+
+    def test_th2_th3_views(self):
+        from uproot3_methods.classes import TH2, TH3
+
+        content = np.arange(6.).reshape(2, 3)
+        h = TH2.from_numpy((content, np.array([0., 1., 2.]), np.array([0., 1., 2., 4.])))
+        np.testing.assert_equal(h.values, content)
+        assert h.allvalues is h.allvalues and np.shares_memory(h.allvalues, h._fArray)
+        assert h.copyvalues().flags.c_contiguous and h.copyvalues().flags.writeable
+        np.testing.assert_equal(h.copyvalues(flow=False), content)
+        h.copyvalues()[2, 3] = 7
+        assert h.allvalues[2, 3] == 5
+        h.values[1, 2] = 7
+        assert h._fArray[2 + 3*4] == 7 and h.allvalues[2, 3] == 7
+        h.values[1, 2] = 5
+        assert h.interval(2, "y") == (1.0, 2.0)
+
+        content, edges = np.histogramdd(np.random.RandomState(0).normal(size=(100, 3)), bins=(2, 3, 4))
+        h = TH3.from_numpy((content, edges))
+        assert h._classname == b"TH3D" and h.allvalues.shape == (4, 5, 6)
+        np.testing.assert_equal(h.values, content)
+        np.testing.assert_equal(h.variances, content)
+        assert h.allvariances is h.allvariances
+        h[1] = 1000
+        assert h.allvalues[1, 0, 0] == 1000
+
+        # a deserialized (list-backed) histogram is converted once, and again only after it is assigned to
+        class ListTH3(TH3.Methods, list):
+            pass
+        listed = ListTH3(h.copyvalues(order="F").reshape(-1, order="F").tolist())
+        listed._fXaxis, listed._fYaxis, listed._fZaxis = h._fXaxis, h._fYaxis, h._fZaxis
+        listed._fSumw2 = np.array(h._fSumw2)
+        assert listed.allvalues is listed.allvalues and listed.allvariances is listed.allvariances
+        assert not listed.allvalues.flags.writeable
+        np.testing.assert_equal(listed.allvalues, h.allvalues)
+        np.testing.assert_equal(listed.allvariances, h.allvariances)
+        listed[1] = 7
+        assert listed.allvalues[1, 0, 0] == 7
+        listed._fSumw2 = np.zeros(len(listed))
+        assert listed.allvariances.sum() == 0
+        assert "_memo_allvalues" not in listed.__getstate__()
+
+    def test_th1_fill(self):
+        import uproot3_methods.common.reduction
+        from uproot3_methods.classes.TH1 import from_numpy
+
+        values = np.random.RandomState(0).normal(size=1001)
+        values[:3] = [np.nan, np.inf, -np.inf]
+        weights = np.random.RandomState(1).uniform(size=len(values))
+        edges = np.linspace(-2, 2, 9)
+        counts = np.histogram(values, edges)[0]
+
+        h = from_numpy((np.zeros(8, dtype=int), edges))
+        blocksize = uproot3_methods.common.reduction.blocksize
+        uproot3_methods.common.reduction.blocksize = 100
+        try:
+            h.fill(values)
+        finally:
+            uproot3_methods.common.reduction.blocksize = blocksize
+        assert h._classname == b"TH1I"
+        np.testing.assert_equal(h.values, counts)
+        assert h.underflows == (values < -2).sum() and h.overflows == np.logical_not(values < 2).sum()
+        inrange = values[(values >= -2) & (values < 2)]
+        assert h._fEntries == len(values) and h._fTsumw == len(inrange)
+        np.testing.assert_almost_equal(h._fTsumwx2, (inrange**2).sum())
+
+        h.fill(values, weights)
+        assert h._classname == b"TH1D"
+        np.testing.assert_almost_equal(h.values, counts + np.histogram(values, edges, weights=weights)[0])
+        np.testing.assert_almost_equal(h.variances, counts + np.histogram(values, edges, weights=weights**2)[0])
+
+        # values on the edges of regular axes land where ROOT's TAxis::FindBin puts them
+        for nbins, low, high in [(10, 0, 0.7), (7, -1.3, 2.9), (30, 0, 3), (13, 0.1, 1.7)]:
+            h = from_numpy((np.zeros(nbins), np.linspace(low, high, nbins + 1)))
+            h.fill(h.edges)
+            expected = np.zeros(nbins + 2)
+            for x in h.edges:
+                expected[1 + int(nbins * (x - low) / (high - low)) if x < high else nbins + 1] += 1
+            np.testing.assert_equal(h.allvalues, expected)
+
+        h = from_numpy((np.zeros(3), np.array([0., 1., 1.5, 4.])))
+        h.fill([0, 0.99, 1, 1.5, 3.99, 4, -1, np.nan], 2.0)
+        np.testing.assert_equal(h.allvalues, [2, 4, 2, 4, 4])
+        np.testing.assert_equal(h.allvariances, [4, 8, 4, 8, 8])
+
+    def test_th2_th3_fill(self):
+        from uproot3_methods.classes import TH2, TH3
+
+        x, y, z = np.random.RandomState(0).normal(size=(3, 1000))
+        weights = np.random.RandomState(1).uniform(size=1000)
+        xedges, yedges, zedges = np.linspace(-2, 2, 5), np.array([-1., 0., 0.5, 3.]), np.linspace(-1, 1, 3)
+
+        h = TH2.from_numpy((np.zeros((4, 3)), xedges, yedges))
+        h.fill(x, y, weights)
+        np.testing.assert_almost_equal(h.values, np.histogram2d(x, y, (xedges, yedges), weights=weights)[0])
+        allx = np.searchsorted(xedges, x, side="right")
+        ally = np.searchsorted(yedges, y, side="right")
+        np.testing.assert_almost_equal(h.allvalues[0, 2], weights[(allx == 0) & (ally == 2)].sum())
+        np.testing.assert_almost_equal(h.allvariances[-1, -1], (weights**2)[(allx == 5) & (ally == 4)].sum())
+        inrange = (allx > 0) & (allx < 5) & (ally > 0) & (ally < 4)
+        np.testing.assert_almost_equal(h._fTsumwxy, (weights * x * y)[inrange].sum())
+
+        h = TH3.from_numpy((np.zeros((4, 3, 2), dtype=int), [xedges, yedges, zedges]))
+        h.fill(x, y, z)
+        np.testing.assert_equal(h.values, np.histogramdd((x, y, z), (xedges, yedges, zedges))[0])
+        assert h.allvalues.sum() == 1000 and h._fEntries == 1000
+
+    def test_fill_jagged(self):
+        import awkward0
+        import uproot3_methods.common.reduction
+        from uproot3_methods.classes import TH1
+
+        counts = np.random.RandomState(0).poisson(3, size=100)
+        pt = np.random.RandomState(1).exponential(30, size=counts.sum())
+        eventweights = np.random.RandomState(2).uniform(size=100)
+        jagged = awkward0.JaggedArray.fromcounts(counts, pt)
+        edges = np.linspace(0, 100, 11)
+        expected = np.histogram(pt, edges, weights=np.repeat(eventweights, counts))[0]
+
+        blocksize = uproot3_methods.common.reduction.blocksize
+        uproot3_methods.common.reduction.blocksize = 7
+        try:
+            h = TH1.from_numpy((np.zeros(10), edges))
+            h.fill(jagged, eventweights)
+            np.testing.assert_almost_equal(h.values, expected)
+            assert h._fEntries == counts.sum()
+
+            h = TH1.from_numpy((np.zeros(10), edges))
+            h.fill(awkward0.ChunkedArray([jagged[:40], jagged[40:]]), awkward0.ChunkedArray([eventweights[:40], eventweights[40:]]))
+            np.testing.assert_almost_equal(h.values, expected)
+        finally:
+            uproot3_methods.common.reduction.blocksize = blocksize
+
+        h = TH1.from_numpy((np.zeros(10), edges))
+        h.fill(jagged, jagged * 0 + 2)
+        np.testing.assert_almost_equal(h.values, 2 * np.histogram(pt, edges)[0])
+        self.assertRaises(ValueError, lambda: h.fill(jagged, eventweights[:10]))
+
+    def test_fill_parallel(self):
+        import concurrent.futures
+        import uproot3_methods.common.reduction
+        from uproot3_methods.classes import TH1, TH2
+
+        x, y = np.random.RandomState(0).normal(size=(2, 10000))
+        weights = np.random.RandomState(1).randint(0, 5, size=10000).astype(float)
+        edges = np.linspace(-3, 3, 13)
+
+        blocksize = uproot3_methods.common.reduction.blocksize
+        uproot3_methods.common.reduction.blocksize = 97
+        try:
+            with concurrent.futures.ThreadPoolExecutor(4) as executor:
+                serial = TH2.from_numpy((np.zeros((12, 12)), edges, edges))
+                serial.fill(x, y, weights)
+                parallel = TH2.from_numpy((np.zeros((12, 12)), edges, edges))
+                parallel.fill(x, y, weights, executor=executor)
+                assert np.array_equal(serial.allvalues, parallel.allvalues)
+                assert np.array_equal(serial.allvariances, parallel.allvariances)
+                for name in ("_fEntries", "_fTsumw", "_fTsumw2", "_fTsumwx", "_fTsumwx2", "_fTsumwy", "_fTsumwy2", "_fTsumwxy"):
+                    assert getattr(serial, name) == getattr(parallel, name)
+
+                first = TH1.from_numpy((np.zeros(12), edges))
+                first.fill(x, x, executor=executor)
+                second = TH1.from_numpy((np.zeros(12), edges))
+                second.fill(x, x, executor=executor)
+                assert np.array_equal(first.allvalues, second.allvalues) and first._fTsumwx2 == second._fTsumwx2
+
+                serial = TH1.from_numpy((np.zeros(12), edges))
+                serial.fill(x, weights)
+                parallel = TH1.from_numpy((np.zeros(12), edges))
+                parallel.fill(x, weights, executor=executor)
+                assert np.array_equal(serial.allvalues, parallel.allvalues)
+                assert serial._fTsumwx == parallel._fTsumwx and serial._fTsumwx2 == parallel._fTsumwx2
+        finally:
+            uproot3_methods.common.reduction.blocksize = blocksize
+
+    def test_th1_variations(self):
+        import awkward0
+        from uproot3_methods.classes.TH1 import TH1Variations, from_numpy
+
+        counts = np.random.RandomState(0).poisson(2, size=50)
+        pt = np.random.RandomState(1).exponential(30, size=counts.sum())
+        weights = np.random.RandomState(2).uniform(size=(50, 9))
+        edges = np.linspace(0, 100, 11)
+
+        h = TH1Variations(from_numpy((np.zeros(10), edges)), 9)
+        h.fill(awkward0.JaggedArray.fromcounts(counts, pt), awkward0.JaggedArray.fromcounts(np.full(50, 9), weights.reshape(-1)))
+        assert h.values.shape == (9, 10)
+        for i, histogram in enumerate(h.histograms()):
+            expected = np.repeat(weights[:, i], counts)
+            np.testing.assert_almost_equal(h.values[i], np.histogram(pt, edges, weights=expected)[0])
+            np.testing.assert_almost_equal(histogram.variances, np.histogram(pt, edges, weights=expected**2)[0])
+            np.testing.assert_almost_equal(histogram._fTsumwx, (expected * pt)[pt < 100].sum())
+        self.assertRaises(ValueError, lambda: h.fill(pt, weights))
+
+    def test_th1_bootstrap(self):
+        import awkward0
+        import uproot3_methods.common.TH
+        from uproot3_methods.classes.TH1 import TH1Variations, from_numpy
+
+        counts = np.random.RandomState(0).poisson(2, size=200)
+        pt = np.random.RandomState(1).exponential(30, size=counts.sum())
+        eventnumbers = np.arange(1000, 1200, dtype=np.uint64)
+        jagged = awkward0.JaggedArray.fromcounts(counts, pt)
+        edges = np.linspace(0, 100, 11)
+
+        whole = TH1Variations(from_numpy((np.zeros(10), edges)), 50)
+        whole.fill_bootstrap(jagged, eventnumbers, seed=12345)
+        chunked = TH1Variations(from_numpy((np.zeros(10), edges)), 50)
+        chunked.fill_bootstrap(awkward0.ChunkedArray([jagged[:77], jagged[77:]]), awkward0.ChunkedArray([eventnumbers[:77], eventnumbers[77:]]), seed=12345)
+        np.testing.assert_almost_equal(whole.allvalues, chunked.allvalues)
+
+        replicas = uproot3_methods.common.TH.poisson1(12345, eventnumbers, 50)
+        np.testing.assert_almost_equal(whole.values[7], np.histogram(pt, edges, weights=np.repeat(replicas[:, 7], counts))[0])
+        np.testing.assert_equal(uproot3_methods.common.TH.poisson1(12345, eventnumbers[[5]], 50), replicas[[5]])
+        assert abs(replicas.mean() - 1) < 0.05
+
+        weighted = TH1Variations(from_numpy((np.zeros(10), edges)), 50)
+        weighted.fill_bootstrap(jagged, eventnumbers, seed=12345, weight=2.0)
+        np.testing.assert_almost_equal(weighted.allvalues, 2 * whole.allvalues)
+
+        # TH2 and TH3: each replica matches a weighted fill of the plain histogram with the same Poisson weights
+        from uproot3_methods.classes import TH2, TH3
+        eta = awkward0.JaggedArray.fromcounts(counts, np.random.RandomState(3).normal(size=counts.sum()))
+        phi = awkward0.JaggedArray.fromcounts(counts, np.random.RandomState(4).uniform(-3, 3, size=counts.sum()))
+        template2 = TH2.from_numpy((np.zeros((10, 4)), edges, np.linspace(-2, 2, 5)))
+        template3 = TH3.from_numpy((np.zeros((10, 4, 3)), [edges, np.linspace(-2, 2, 5), np.linspace(-3, 3, 4)]))
+        for variations, coordinates in ((TH2.TH2Variations(template2, 50), (jagged, eta)), (TH3.TH3Variations(template3, 50), (jagged, eta, phi))):
+            variations.fill_bootstrap(*(coordinates + (eventnumbers,)), seed=12345)
+            assert variations.allvalues.shape == (50,) + template3.allvalues.shape[:len(coordinates)]
+            single = variations.histogram(7)
+            expected = (template2 if len(coordinates) == 2 else template3)._copy()
+            expected.fill(*(coordinates + (awkward0.JaggedArray.fromcounts(counts, np.repeat(replicas[:, 7], counts)),)))
+            np.testing.assert_almost_equal(variations.values[7], expected.values)
+            np.testing.assert_almost_equal(single.allvariances, expected.allvariances)
+            for name in ("_fTsumw", "_fTsumwx", "_fTsumwy2", "_fTsumwxy"):
+                self.assertAlmostEqual(getattr(single, name), getattr(expected, name))
+            assert single._classname == expected._classname and single._fEntries == counts.sum()
+
+    def test_arithmetic(self):
+        from uproot3_methods.classes import TH1, TH2
+
+        edges = np.linspace(0, 4, 5)
+        a = TH1.from_numpy((np.array([1, 2, 3, 4]), edges))
+        b = TH1.from_numpy((np.array([4., 3., 2., 0.]), edges))
+
+        total = a + b
+        assert total._classname == b"TH1D" and a._classname == b"TH1I"
+        np.testing.assert_equal(total.values, [5, 5, 5, 4])
+        np.testing.assert_equal(total.variances, [5, 5, 5, 4])
+        assert total._fEntries == a._fEntries + b._fEntries and total._fTsumwx == a._fTsumwx + b._fTsumwx
+        np.testing.assert_equal((a - b).values, [-3, -1, 1, 4])
+        np.testing.assert_equal((a - b).variances, [5, 5, 5, 4])
+        np.testing.assert_equal(sum([a, b, a]).values, [6, 7, 8, 8])
+
+        scaled = np.float64(2) * a
+        np.testing.assert_equal(scaled.values, [2, 4, 6, 8])
+        np.testing.assert_equal(scaled.variances, [4, 8, 12, 16])
+        assert scaled._fTsumw == 2 * a._fTsumw and scaled._fTsumw2 == 4 * a._fTsumw2
+
+        ratio = a / b
+        np.testing.assert_almost_equal(ratio.values, [0.25, 2/3., 1.5, 0])
+        np.testing.assert_almost_equal(ratio.variances, [(1*16 + 4*1)/4.**4, (2*9 + 3*4)/3.**4, (3*4 + 2*9)/2.**4, 0])
+        np.testing.assert_almost_equal(ratio._fTsumw, ratio.values.sum())
+
+        before = a
+        a += b
+        a /= 2
+        assert a is before and a._classname == b"TH1D"
+        np.testing.assert_equal(a.values, [2.5, 2.5, 2.5, 2])
+        np.testing.assert_equal(a.variances, [1.25, 1.25, 1.25, 1])
+
+        self.assertRaises(ValueError, lambda: a + TH1.from_numpy((np.zeros(3), np.linspace(0, 3, 4))))
+
+        h = TH2.from_numpy((np.ones((2, 2)), np.array([0., 1., 2.]), np.array([0., 1., 2.])))
+        np.testing.assert_equal((h + h).values, [[2, 2], [2, 2]])
+        assert (h * h)._fTsumwxy == 4.0
+
+        # other ufuncs, and operations the histogram operators do not define, act on the bin contents
+        class ListTH1(TH1.Methods, list):
+            pass
+        listed = ListTH1([0., 1., 4., 9., 0.])
+        listed._fXaxis, listed._classname = TH1.from_numpy((np.zeros(3), np.linspace(0, 3, 4)))._fXaxis, b"TH1F"
+        for h in (TH1.from_numpy((np.array([1., 4., 9.]), np.linspace(0, 3, 4))), listed):
+            np.testing.assert_equal(np.sqrt(h), [0, 1, 2, 3, 0])
+            np.testing.assert_equal(np.add(h, np.ones(5)), [1, 2, 5, 10, 1])
+            np.testing.assert_equal((h + np.float64(0)).values, [1, 4, 9])
+            # adding or subtracting a non-zero number is refused, whatever its type
+            for number in (1, np.float64(1)):
+                self.assertRaises(TypeError, lambda: h + number)
+                self.assertRaises(TypeError, lambda: number + h)
+                self.assertRaises(TypeError, lambda: h - number)
+                self.assertRaises(TypeError, lambda: np.add(h, number))
+            np.testing.assert_equal((np.float64(2) * h).values, [2, 8, 18])
+            np.testing.assert_equal(np.multiply(h, h).values, [1, 16, 81])
+
+    def test_merge(self):
+        import concurrent.futures
+        import uproot3_methods.common.TH
+        from uproot3_methods.classes import TH1, TH2
+
+        edges = np.linspace(0, 4, 5)
+        contents = np.random.RandomState(0).poisson(5, size=(150, 4))
+        def histograms():
+            for i, x in enumerate(contents):
+                h = TH1.from_numpy((x, edges))
+                h._fName = b"pt"
+                yield h
+                yield b"eta", TH2.from_numpy((x.reshape(2, 2).astype(float), edges[:3], edges[:3]))
+
+        ptkey = (uproot3_methods.common.TH.fingerprint(TH1.from_numpy((contents[0], edges))._fXaxis),)
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            for merged in (uproot3_methods.common.TH.merge(histograms()), uproot3_methods.common.TH.merge(histograms(), executor)):
+                assert sorted(merged) == [b"eta", b"pt"] and list(merged[b"pt"]) == [ptkey] and len(merged[b"eta"]) == 1
+                pt, = merged[b"pt"].values()
+                np.testing.assert_equal(pt.values, contents.sum(axis=0))
+                np.testing.assert_equal(pt.variances, contents.sum(axis=0))
+                assert pt._fEntries == contents.sum()
+                eta, = merged[b"eta"].values()
+                np.testing.assert_equal(eta.values, contents.sum(axis=0).reshape(2, 2))
+
+        # a name seen with several binnings gets one histogram per binning, under the same name
+        mismatched = [(b"pt", TH1.from_numpy((x, edges * (1 + i % 2)))) for i, x in enumerate(contents[:4])] + [(b"eta", TH1.from_numpy((contents[4], edges)))]
+        merged = uproot3_methods.common.TH.merge(mismatched)
+        assert sorted(merged) == [b"eta", b"pt"] and len(merged[b"pt"]) == 2
+        np.testing.assert_equal(merged[b"eta"][ptkey].values, contents[4])
+        for scale in (1, 2):
+            key = (uproot3_methods.common.TH.fingerprint(TH1.from_numpy((contents[0], edges * scale))._fXaxis),)
+            np.testing.assert_equal(merged[b"pt"][key].values, contents[scale - 1:4:2].sum(axis=0))
+
+    def test_rebin_slice_project(self):
+        from uproot3_methods.classes import TH1, TH2, TH3
+
+        h = TH1.from_numpy((np.array([1, 2, 3, 4, 5]), np.linspace(0, 5, 6)))
+        h[0], h[-1] = 10, 20
+        rebinned = h.rebin(2)
+        assert rebinned._classname == b"TH1I" and rebinned._fEntries == h._fEntries
+        np.testing.assert_equal(rebinned.edges, [0, 2, 4])
+        np.testing.assert_equal(rebinned.allvalues, [10, 3, 7, 25])
+        np.testing.assert_equal(rebinned.allvariances, [0, 3, 7, 5])
+        np.testing.assert_equal(h.rebin([1., 2., 5.]).allvalues, [11, 2, 12, 20])
+        self.assertRaises(ValueError, lambda: h.rebin([1., 2.5, 5.]))
+
+        sliced = h.slice((1.5, 3.2))
+        np.testing.assert_equal(sliced.edges, [1, 2, 3, 4])
+        np.testing.assert_equal(sliced.allvalues, [11, 2, 3, 4, 25])
+        assert sliced._fTsumw == 9
+
+        content = np.arange(24.).reshape(2, 3, 4)
+        h = TH3.from_numpy((content, [np.linspace(0, 2, 3), np.linspace(0, 3, 4), np.linspace(0, 4, 5)]))
+        projected = h.project("zx")
+        assert isinstance(projected, TH2.TH2) and projected.allvalues.shape == (6, 4)
+        np.testing.assert_equal(projected.values, content.sum(axis=1).T)
+        np.testing.assert_equal(h.project("y").values, content.sum(axis=(0, 2)))
+        np.testing.assert_equal(h.rebin(None, None, 2).values, content.reshape(2, 3, 2, 2).sum(axis=3))
+
+    def test_lookup(self):
+        import awkward0
+        from uproot3_methods.classes import TH1, TH2
+
+        h = TH1.from_numpy((np.array([1., 2., 3.]), np.array([0., 1., 2., 5.])))
+        h[0], h[-1] = -1, 9
+        coordinates = [-5, 0, 1.5, 4.9, 5, np.nan]
+        np.testing.assert_equal(h.lookup(coordinates), [1, 1, 2, 3, 3, 3])
+        np.testing.assert_equal(h.lookup(coordinates, overflow="overflow"), [-1, 1, 2, 3, 9, 9])
+        assert h.lookup(1.5) == 2 and h.lookup(1.5, errors=True) == (2, np.sqrt(2))
+        self.assertRaises(ValueError, lambda: h.lookup(1.5, overflow="wrap"))
+        assert TH1.from_numpy((np.arange(10.), np.linspace(0, 0.7, 11))).lookup(0.49) == 7
+
+        h = TH2.from_numpy((np.arange(6.).reshape(2, 3), np.linspace(0, 2, 3), np.linspace(0, 3, 4)))
+        x = awkward0.JaggedArray.fromcounts([2, 0, 1], [0.5, 1.5, 9.])
+        y = awkward0.JaggedArray.fromcounts([2, 0, 1], [2.5, 0.1, 1.])
+        assert h.lookup(x, y).tolist() == [[2, 3], [], [4]]
+        assert h.lookup(awkward0.ChunkedArray([x[:1], x[1:]]), awkward0.ChunkedArray([y[:1], y[1:]])).tolist() == [[2, 3], [], [4]]
+        np.testing.assert_equal(h.lookup(np.array([[0.5], [1.5]]), np.array([0.5, 1.5, 2.5])), [[0, 1, 2], [3, 4, 5]])
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot3-methods/blob/master/LICENSE
+
+import unittest
+
+import numpy
+
+import awkward0
+from uproot3_methods import *
+import uproot3_methods.substructure
+
+class Test(unittest.TestCase):
+    def runTest(self):
+        pass
+
+    def test_nsubjettiness(self):
+        # one event with two jets: two collinear-ish prongs, and a single constituent
+        pt = awkward0.JaggedArray.fromcounts([2], awkward0.JaggedArray.fromcounts([3, 1], [10.0, 10.0, 1.0, 5.0]))
+        eta = awkward0.JaggedArray.fromcounts([2], awkward0.JaggedArray.fromcounts([3, 1], [0.0, 0.4, 0.1, 1.0]))
+        phi = awkward0.JaggedArray.fromcounts([2], awkward0.JaggedArray.fromcounts([3, 1], [0.0, 0.0, 0.0, 1.0]))
+        constituents = TLorentzVectorArray.from_ptetaphim(pt, eta, phi, pt*0)
+
+        tau1, tau2, tau3 = uproot3_methods.substructure.nsubjettiness(constituents, (1, 2, 3))
+        assert tau1.counts.tolist() == [2]
+        assert tau1[0][1] == 0 and tau2[0][1] == 0 and tau3[0].tolist() == [0, 0]
+        assert tau2[0][0] < tau1[0][0]
+
+        # the third constituent joins the first prong, pulling its axis toward eta = 0.1
+        axis = numpy.arcsinh(numpy.sinh(0.1) / 11.0)
+        self.assertAlmostEqual(tau2[0][0], (10.0 * axis + 1.0 * (0.1 - axis)) / (21.0 * 0.8))
+        assert uproot3_methods.substructure.nsubjettiness(constituents, 2).tolist() == tau2.tolist()
+
+    def test_ecf(self):
+        pt = awkward0.JaggedArray.fromcounts([3, 0], [1.0, 2.0, 1.0])
+        eta = awkward0.JaggedArray.fromcounts([3, 0], [0.0, 0.3, 0.5])
+        phi = awkward0.JaggedArray.fromcounts([3, 0], [0.0, 0.4, -0.2])
+        constituents = TLorentzVectorArray.from_ptetaphim(pt, eta, phi, pt*0)
+
+        z = numpy.array([0.25, 0.5, 0.25])
+        R = lambda i, j: numpy.hypot(eta.content[i] - eta.content[j], phi.content[i] - phi.content[j])
+        e2 = z[0]*z[1]*R(0, 1) + z[0]*z[2]*R(0, 2) + z[1]*z[2]*R(1, 2)
+        e3 = z[0]*z[1]*z[2]*R(0, 1)*R(0, 2)*R(1, 2)
+
+        self.assertAlmostEqual(uproot3_methods.substructure.ecf(constituents, 2)[0], e2)
+        self.assertAlmostEqual(uproot3_methods.substructure.ecf(constituents, 3)[0], e3)
+        self.assertAlmostEqual(uproot3_methods.substructure.c2(constituents)[0], e3 / e2**2)
+        self.assertAlmostEqual(uproot3_methods.substructure.d2(constituents)[0], e3 / e2**3)
+        assert len(uproot3_methods.substructure.ecf(constituents, 2)) == 2
+
+    def test_mixed_multiplicity(self):
+        # jets of different multiplicities are computed separately, so each result matches the jet alone
+        counts = [3, 7, 1, 3, 0]
+        numpy.random.seed(7)
+        pt = numpy.random.uniform(1, 50, sum(counts))
+        eta = numpy.random.uniform(-0.5, 0.5, sum(counts))
+        phi = numpy.random.uniform(-0.5, 0.5, sum(counts))
+        jets = TLorentzVectorArray.from_ptetaphim(awkward0.JaggedArray.fromcounts(counts, pt), awkward0.JaggedArray.fromcounts(counts, eta), awkward0.JaggedArray.fromcounts(counts, phi), awkward0.JaggedArray.fromcounts(counts, pt*0))
+
+        tau2 = uproot3_methods.substructure.nsubjettiness(jets, 2)
+        e3 = uproot3_methods.substructure.ecf(jets, 3)
+        start = 0
+        for i, count in enumerate(counts):
+            alone = TLorentzVectorArray.from_ptetaphim(awkward0.JaggedArray.fromcounts([count], pt[start:start + count]), awkward0.JaggedArray.fromcounts([count], eta[start:start + count]), awkward0.JaggedArray.fromcounts([count], phi[start:start + count]), awkward0.JaggedArray.fromcounts([count], pt[start:start + count]*0))
+            self.assertAlmostEqual(tau2[i], uproot3_methods.substructure.nsubjettiness(alone, 2)[0])
+            self.assertAlmostEqual(e3[i], uproot3_methods.substructure.ecf(alone, 3)[0])
+            start += count
+
+        self.assertRaises(ValueError, uproot3_methods.substructure.ecf, jets, 4)
@@ -205,3 +205,264 @@ class Test(unittest.TestCase):
             self.assertAlmostEqual(aroti.y,-ai.y)
             self.assertAlmostEqual(aroti.z,ai.z)
             assert aroti.t==ai.t
+
+    def test_approximate(self):
+        import uproot3_methods.common.approx
+        a = TVector3Array(numpy.linspace(-5, 5, 100), numpy.linspace(3, -4, 100), numpy.linspace(-1, 2, 100))
+        b = TLorentzVectorArray(numpy.linspace(-5, 5, 100), numpy.linspace(3, -4, 100), numpy.linspace(-1, 2, 100), numpy.full(100, 20.0))
+
+        with uproot3_methods.common.approx.approximate():
+            assert a.phi.dtype == numpy.float32
+            assert b.eta.dtype == numpy.float32
+        assert not uproot3_methods.common.approx.enabled
+        assert a.phi.dtype == numpy.float64
+
+        errors = uproot3_methods.common.approx.validate(a, ("phi", "theta"))
+        assert errors["phi"]["maxabs"] < uproot3_methods.common.approx.errors["phi"]
+        assert errors["theta"]["maxabs"] < uproot3_methods.common.approx.errors["theta"]
+        errors = uproot3_methods.common.approx.validate(b, ("eta", "mass"))
+        assert errors["eta"]["maxabs"] < uproot3_methods.common.approx.errors["eta"]
+        assert errors["mass"]["mismatched"] == 0
+
+    def test_kernels(self):
+        import uproot3_methods.common.kernels
+        a = TVector2Array.from_cartesian(awkward0.JaggedArray.fromcounts([3, 0, 2], [1.0, 2.0, 3.0, 4.0, 5.0]), awkward0.JaggedArray.fromcounts([3, 0, 2], [0.5, 1.0, 1.5, 2.0, 2.5]))
+        b = TVector2Array.from_cartesian(numpy.array([10.0, 20.0, 30.0]), numpy.array([-1.0, -2.0, -3.0]))
+        c = TLorentzVectorArray.from_ptetaphim(a.x, a.y, a.y - a.x, a.x * 0.1)
+        d = TLorentzVectorArray.from_ptetaphim(a.y, a.x, a.x - a.y, a.y * 0.1)
+
+        previous = uproot3_methods.common.kernels.enabled
+        results = []
+        try:
+            for enabled in (False, True):
+                uproot3_methods.common.kernels.enabled = enabled
+                results.append([(a + b).x.tolist(), (a - b).y.tolist(), a.rotate(0.3).x.tolist(), a.sum().x.tolist(), c.sum().t.tolist(), c.mass.tolist(), c.delta_r(d).tolist()])
+        finally:
+            uproot3_methods.common.kernels.enabled = previous
+
+        for exact, compiled in zip(*results):
+            self.assertEqual(len(awkward0.fromiter(exact).flatten()), len(awkward0.fromiter(compiled).flatten()))
+            for x, y in zip(awkward0.fromiter(exact).flatten(), awkward0.fromiter(compiled).flatten()):
+                self.assertAlmostEqual(x, y)
+
+        # opt-in: off unless requested through the environment, and scoped by the context manager
+        import os
+        assert uproot3_methods.common.kernels.enabled == (uproot3_methods.common.kernels.numba is not None and os.environ.get("UPROOT3_METHODS_NUMBA", "0") not in ("", "0"))
+        if uproot3_methods.common.kernels.numba is not None:
+            with uproot3_methods.common.kernels.compiled():
+                assert uproot3_methods.common.kernels.enabled
+                numpy.testing.assert_almost_equal(c.mass.flatten(), awkward0.fromiter(results[0][5]).flatten())
+            assert uproot3_methods.common.kernels.enabled == previous
+
+    def test_parallel(self):
+        import concurrent.futures
+        import uproot3_methods.common.parallel
+        chunks = [TLorentzVectorArray.from_ptetaphim(numpy.array([1.0, 2.0, 3.0]), numpy.array([0.0, 0.5, 1.0]), numpy.array([0.1, 0.2, 0.3]), numpy.zeros(3)),
+                  TLorentzVectorArray.from_ptetaphim(numpy.array([4.0, 5.0]), numpy.array([-1.0, 2.0]), numpy.array([-0.4, 3.0]), numpy.ones(2))]
+        a = awkward0.Methods.maybemixin(type(chunks[0]), awkward0.ChunkedArray)(chunks, [3, 2])
+        b = TLorentzVectorArray.from_ptetaphim(numpy.ones(5), numpy.zeros(5), numpy.zeros(5), numpy.zeros(5))
+
+        expected = a.delta_r(b).tolist(), a.x.tolist()
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            with uproot3_methods.common.parallel.using(executor):
+                dr, x = a.delta_r(b), a.x
+        assert uproot3_methods.common.parallel.executor is None
+        assert isinstance(dr, awkward0.ChunkedArray) and dr.chunksizes == [3, 2]
+        assert (dr.tolist(), x.tolist()) == expected
+
+    def test_sum(self):
+        import concurrent.futures
+        import uproot3_methods.common.parallel
+        import uproot3_methods.common.reduction
+        x = awkward0.JaggedArray.fromcounts([0, 3, 0, 2, 1], [1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+        a = TVector2Array.from_cartesian(x, x * 10)
+        b = awkward0.Methods.maybemixin(type(a), awkward0.ChunkedArray)([a[:2], a[2:]], [2, 3])
+
+        previous = uproot3_methods.common.reduction.blocksize
+        try:
+            uproot3_methods.common.reduction.blocksize = 2
+            with concurrent.futures.ThreadPoolExecutor(2) as executor:
+                with uproot3_methods.common.parallel.using(executor):
+                    assert a.sum().x.tolist() == [0, 6, 0, 9, 6]
+                    assert b.sum().y.tolist() == [0, 60, 0, 90, 60]
+                    assert a[[1, 3]].sum().x.tolist() == [6, 9]
+                    assert a[1:4].sum().x.tolist() == [6, 0, 9]
+                    assert a.content.sum() == TVector2(21, 210)
+        finally:
+            uproot3_methods.common.reduction.blocksize = previous
+
+        assert uproot3_methods.common.reduction.treereduce([1, 2, 3, 4, 5]) == 15
+
+    def test_from_objects(self):
+        a = TLorentzVectorArray.from_objects([TLorentzVector(1, 2, 3, 4), TLorentzVector(5, 6, 7, 8)])
+        assert a.tolist() == [TLorentzVector(1, 2, 3, 4), TLorentzVector(5, 6, 7, 8)]
+        b = TLorentzVectorArray.from_objects([[PtEtaPhiMassLorentzVector(1, 2, 3, 4)], [], [PtEtaPhiMassLorentzVector(5, 0, 0, 1)]])
+        assert b.counts.tolist() == [1, 0, 1]
+        assert b.mass.tolist() == [[4], [], [1]]
+        assert TVector2Array.from_objects([TVector2(1, 2), TVector2(3, 4)]).tolist() == [TVector2(1, 2), TVector2(3, 4)]
+        assert TVector3Array.from_objects([[TVector3(1, 2, 3)], []]).tolist() == [[TVector3(1, 2, 3)], []]
+
+    def test_from_records(self):
+        records = numpy.zeros(3, dtype=[("px", "f8"), ("py", "f8"), ("pz", "f8"), ("E", "f8"), ("charge", "i4")])
+        records["px"] = [1, 2, 3]
+        records["E"] = 10
+        a = TLorentzVectorArray.from_records(records)
+        assert a.x.tolist() == [1, 2, 3] and a.t.tolist() == [10, 10, 10]
+        assert numpy.shares_memory(a.x, records)
+        assert TLorentzVectorArray.from_records(records.tobytes(), dtype=records.dtype).x.tolist() == [1, 2, 3]
+        assert TVector2Array.from_records(records, names=("px", "py")).tolist() == [TVector2(1, 0), TVector2(2, 0), TVector2(3, 0)]
+        self.assertRaises(ValueError, lambda: TVector3Array.from_records(records))
+
+        b = TLorentzVectorArray.from_records(numpy.array([(1.0, 0.0, 0.0, 5.0)], dtype=[("pt", "f4"), ("eta", "f4"), ("phi", "f4"), ("mass", "f4")]))
+        assert isinstance(b, uproot3_methods.classes.TLorentzVector.PtEtaPhiMassLorentzVectorArray)
+        assert b.mass.tolist() == [5]
+
+        # names as a list select the same coordinates as the tuple; custom names need an explicit coordinate system
+        c = numpy.array([(1.0, 0.0, 0.0, 5.0)], dtype=[("pt", "f8"), ("eta", "f8"), ("phi", "f8"), ("mass", "f8")])
+        assert TLorentzVectorArray.from_records(c, names=["pt", "eta", "phi", "mass"]).mass.tolist() == [5]
+        d = c.astype([("jpt", "f8"), ("jeta", "f8"), ("jphi", "f8"), ("jm", "f8")])
+        self.assertRaises(ValueError, lambda: TLorentzVectorArray.from_records(d, names=["jpt", "jeta", "jphi", "jm"]))
+        assert TLorentzVectorArray.from_records(d, names=["jpt", "jeta", "jphi", "jm"], coordinates="ptetaphim").mass.tolist() == [5]
+        assert TLorentzVectorArray.from_records(d, names=["jpt", "jeta", "jphi", "jm"], coordinates="cartesian").t.tolist() == [5]
+
+    def test_scalar_slots(self):
+        import pickle
+        a = TLorentzVector(1, 2, 3, 4)
+        assert a.__dict__ == {}
+        assert (a._fX, a._fY, a._fZ, a._fE) == (1, 2, 3, 4)
+        assert a.p3 == TVector3(1, 2, 3)
+        a._fP = TVector3(5, 6, 7)
+        assert a == TLorentzVector(5, 6, 7, 4)
+
+        # p3 and _fP are views of the flat storage, so mutating them mutates the vector, as with a nested fP
+        a.p3.x = 8
+        a._fP._fY = 9
+        assert a == TLorentzVector(8, 9, 7, 4)
+        p3 = a.p3
+        a.z = 10
+        assert p3 == TVector3(8, 9, 10) and p3 + TVector3(1, 1, 1) == TVector3(9, 10, 11)
+        assert pickle.loads(pickle.dumps(a)) == a
+        assert pickle.loads(pickle.dumps(PtEtaPhiMassLorentzVector(10, 0.5, 0.1, 3))).mass == 3
+        assert TVector2(1, 2).__dict__ == {} and TVector3(1, 2, 3).__dict__ == {}
+
+        # every base defined here has __slots__, so only awkward0.Methods contributes the (empty) __dict__
+        for v in (TVector2(1, 2), TVector3(1, 2, 3), TLorentzVector(1, 2, 3, 4), PtEtaPhiMassLorentzVector(10, 0.5, 0.1, 3)):
+            for cls in type(v).__mro__:
+                if cls.__module__.startswith("uproot3_methods"):
+                    assert "__slots__" in cls.__dict__, cls
+            v.mag, v + v, v * 2, -v, v == v
+            assert v.__dict__ == {}
+        b = TLorentzVector(1, 2, 3, 4)
+        b.boost(b.boostp3 * -0.5).rotatez(0.3).p3.unit
+        b.x = 5
+        assert b.__dict__ == {}
+
+    def test_scalar_broadcast(self):
+        a = TVector2Array.from_cartesian(awkward0.JaggedArray.fromcounts([2, 0, 1], [1.0, 2.0, 3.0]), awkward0.JaggedArray.fromcounts([2, 0, 1], [4.0, 5.0, 6.0]))
+        assert (TVector2(10, 20) + a).tolist() == (a + TVector2(10, 20)).tolist() == [[TVector2(11, 24), TVector2(12, 25)], [], [TVector2(13, 26)]]
+        b = TLorentzVectorArray.from_cartesian(numpy.array([1.0, 2.0]), numpy.zeros(2), numpy.zeros(2), numpy.array([5.0, 6.0]))
+        assert (TLorentzVector(1, 1, 1, 1) + b).tolist() == [TLorentzVector(2, 1, 1, 6), TLorentzVector(3, 1, 1, 7)]
+
+        s = TVector3(1, 2, 3)
+        repeated = numpy.empty(4, dtype=object)
+        repeated[:] = [s] * 4
+        assert uproot3_methods.base._unbroadcast(repeated) is s
+        assert uproot3_methods.base._unbroadcast(numpy.broadcast_to(repeated[:1], (4,))) is s
+        repeated[1] = TVector3(0, 0, 0)
+        assert uproot3_methods.base._unbroadcast(repeated) is repeated
+
+    def test_cosdelta(self):
+        import uproot3_methods.common.kernels
+        a = TVector3Array.from_cartesian(awkward0.JaggedArray.fromcounts([2, 0, 1], [0.0, 1.0, 1.0]), awkward0.JaggedArray.fromcounts([2, 0, 1], [0.0, 1.0, 0.0]), awkward0.JaggedArray.fromcounts([2, 0, 1], [0.0, 0.0, 0.0]))
+        b = TVector2Array.from_cartesian(numpy.array([1.0, 0.0]), numpy.array([0.0, 2.0]))
+
+        previous = uproot3_methods.common.kernels.enabled
+        try:
+            for enabled in (False, True):
+                uproot3_methods.common.kernels.enabled = enabled
+                cosdelta = a.cosdelta(TVector3(1, 0, 0))
+                assert cosdelta.counts.tolist() == [2, 0, 1]
+                numpy.testing.assert_almost_equal(cosdelta.flatten(), [1.0, numpy.sqrt(0.5), 1.0])
+                numpy.testing.assert_almost_equal(b.angle(-3 * b), [numpy.pi, numpy.pi])
+        finally:
+            uproot3_methods.common.kernels.enabled = previous
+
+        assert b.isopposite(-b).tolist() == [True, True]
+        assert b.isperpendicular(b.rotate(numpy.pi / 2)).tolist() == [True, True]
+        assert a.isopposite(-a).flatten().tolist() == [True, True, True]
+        assert TVector2(1, 0).isopposite(TVector2(-1, 0)) and TVector3(1, 0, 0).isperpendicular(TVector3(0, 1, 0))
+
+    def test_vector3_spherical_cylindrical(self):
+        r, theta, phi = numpy.array([1.0, 2.0, 3.0]), numpy.array([0.5, 1.0, 2.0]), numpy.array([0.1, -2.0, 3.0])
+        cartesian = TVector3Array.from_cartesian(r * numpy.sin(theta) * numpy.cos(phi), r * numpy.sin(theta) * numpy.sin(phi), r * numpy.cos(theta))
+
+        a = TVector3Array.from_spherical(r, theta, phi)
+        assert isinstance(a, uproot3_methods.classes.TVector3.SphericalTVector3Array)
+        assert a.mag.tolist() == [1, 2, 3] and a.theta.tolist() == [0.5, 1, 2]
+        numpy.testing.assert_almost_equal(a.x, cartesian.x)
+        numpy.testing.assert_almost_equal(a.z, cartesian.z)
+        b = a * -2
+        assert isinstance(b, uproot3_methods.classes.TVector3.SphericalTVector3Array)
+        assert b.mag.tolist() == [2, 4, 6]
+        numpy.testing.assert_almost_equal(b.y, -2 * cartesian.y)
+        numpy.testing.assert_almost_equal((a + cartesian).x, 2 * cartesian.x)
+        numpy.testing.assert_almost_equal(a.rotatez(1.0).x, cartesian.rotatez(1.0).x)
+
+        c = TVector3Array.from_cylindrical(awkward0.JaggedArray.fromcounts([2, 0, 1], r), awkward0.JaggedArray.fromcounts([2, 0, 1], phi), awkward0.JaggedArray.fromcounts([2, 0, 1], theta))
+        assert c.rho.tolist() == [[1, 2], [], [3]] and c.z.tolist() == [[0.5, 1], [], [2]]
+        numpy.testing.assert_almost_equal(c.x.flatten(), r * numpy.cos(phi))
+        numpy.testing.assert_almost_equal((c * -1).x.flatten(), -r * numpy.cos(phi))
+        assert (c * -1).rho.tolist() == [[1, 2], [], [3]]
+
+        # negation turns the vector around (phi + pi, and theta -> pi - theta) instead of negating the stored r or rho
+        d = TVector3Array.from_cylindrical(r, phi, theta)
+        cylindrical = TVector3Array.from_cartesian(d.x, d.y, d.z)
+        for vector, expected in ((a, cartesian), (d, cylindrical), (c, c._to_cartesian())):
+            for component in ("x", "y", "z"):
+                numpy.testing.assert_almost_equal(getattr(-vector, component).flatten(), getattr(-expected, component).flatten())
+                numpy.testing.assert_almost_equal(getattr(+vector, component).flatten(), getattr(expected, component).flatten())
+            numpy.testing.assert_almost_equal(abs(vector).flatten(), expected.mag.flatten())
+        assert (-a).mag.tolist() == [1, 2, 3] and (-d).rho.tolist() == [1, 2, 3]
+        numpy.testing.assert_almost_equal((-a).theta, numpy.pi - theta)
+        numpy.testing.assert_almost_equal(numpy.sin(a).y, numpy.sin(cartesian.y))
+
+    def test_vector2_polar(self):
+        rho, phi = numpy.array([1.0, 2.0, 3.0]), numpy.array([0.1, -3.0, 2.5])
+        cartesian = TVector2Array.from_cartesian(rho * numpy.cos(phi), rho * numpy.sin(phi))
+
+        a = TVector2Array.from_polar(rho, phi)
+        assert isinstance(a, uproot3_methods.classes.TVector2.PolarTVector2Array)
+        assert a.rho.tolist() == [1, 2, 3] and a.phi.tolist() == [0.1, -3.0, 2.5]
+        numpy.testing.assert_almost_equal(a.x, cartesian.x)
+        numpy.testing.assert_almost_equal(a.rotate(1.0).y, cartesian.rotate(1.0).y)
+        b = a * -2
+        assert isinstance(b, uproot3_methods.classes.TVector2.PolarTVector2Array)
+        assert b.rho.tolist() == [2, 4, 6]
+        numpy.testing.assert_almost_equal(b.x, -2 * cartesian.x)
+        numpy.testing.assert_almost_equal((cartesian - a).y, [0, 0, 0])
+
+        # negation turns phi around instead of negating the stored rho
+        numpy.testing.assert_almost_equal((-a).x, -cartesian.x)
+        numpy.testing.assert_almost_equal((-a).y, -cartesian.y)
+        assert (-a).rho.tolist() == [1, 2, 3] and abs(a).tolist() == [1, 2, 3]
+        c = TVector2Array.from_polar(awkward0.JaggedArray.fromcounts([2, 0, 1], rho), awkward0.JaggedArray.fromcounts([2, 0, 1], phi))
+        numpy.testing.assert_almost_equal((-c).y.flatten(), -cartesian.y)
+
+    def test_propagate_met(self):
+        counts = [2, 0, 1]
+        nominal = TVector2Array.from_cartesian(awkward0.JaggedArray.fromcounts(counts, [1.0, 2.0, 3.0]), awkward0.JaggedArray.fromcounts(counts, [0.0, 1.0, -1.0]))
+        variations = [nominal * 1.1, nominal * 0.9]
+        met = TVector2Array.from_cartesian(numpy.array([10.0, 20.0, 30.0]), numpy.array([0.0, 5.0, -5.0]))
+        out = TVector2Array.propagate_met(met, nominal, variations)
+        assert out.counts.tolist() == [3, 3]
+        numpy.testing.assert_almost_equal(out[0].x, [9.7, 20.0, 29.7])
+        numpy.testing.assert_almost_equal(out[1].y, [5.0 + 0.1 - 5.0, 5.0, -5.0 - 0.1])
+        self.assertRaises(ValueError, lambda: TVector2Array.propagate_met(met, nominal, [TVector2Array.from_cartesian(awkward0.JaggedArray.fromcounts([1, 1, 1], [1.0, 2.0, 3.0]), awkward0.JaggedArray.fromcounts([1, 1, 1], [0.0, 1.0, -1.0]))]))
+
+        # sliced and masked (non-compact) jets: the last event must not run to the end of the content
+        numpy.testing.assert_almost_equal(TVector2Array.propagate_met(met[:2], nominal[:2], [x[:2] for x in variations])[0].x, [9.7, 20.0])
+        numpy.testing.assert_almost_equal(TVector2Array.propagate_met(met[1:], nominal[1:], [x[1:] for x in variations])[0].x, [20.0, 29.7])
+        masked = nominal.copy(starts=nominal.starts + numpy.array([1, 0, 0]), stops=nominal.stops)
+        compact = TVector2Array.from_cartesian(awkward0.JaggedArray.fromcounts([1, 0, 1], [2.0, 3.0]), awkward0.JaggedArray.fromcounts([1, 0, 1], [1.0, -1.0]))
+        out = TVector2Array.propagate_met(met, masked, [compact * 1.1])
+        numpy.testing.assert_almost_equal(out[0].x, [10.0 - 0.2, 20.0, 30.0 - 0.3])
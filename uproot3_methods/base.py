@@ -2,10 +2,31 @@
 
 # BSD 3-Clause License; see https://github.com/scikit-hep/uproot3-methods/blob/master/LICENSE
 
+import numpy
+
 import awkward0
 import awkward0.util
 
+def _unbroadcast(x):
+    # NumPy may pass a scalar vector to __array_ufunc__ as an object array of references to it;
+    # strides and a few probes settle most cases without comparing every reference
+    if not isinstance(x, numpy.ndarray) or x.dtype != numpy.dtype(object) or x.size == 0:
+        return x
+    first = x.reshape(-1)[0]
+    if all(stride == 0 for stride in x.strides):
+        return first
+    if len(x.shape) != 1 or x[-1] is not first or x[len(x) // 2] is not first:
+        return x
+    idarray = numpy.frombuffer(numpy.ascontiguousarray(x), dtype=numpy.uintp)
+    if (idarray == idarray[0]).all():
+        return first
+    else:
+        return x
+
 class ROOTMethods(awkward0.Methods):
+    # empty, so that subclasses with __slots__ do not get a __dict__ from here (awkward0.Methods still gives them one)
+    __slots__ = ()
+
     _arraymethods = None
 
     awkward = awkward0
@@ -9,14 +9,23 @@ import sys
 import numpy
 
 import uproot3_methods.base
+import uproot3_methods.common.TH
+
+class Methods(uproot3_methods.common.TH.ListBacked, uproot3_methods.common.TH.Arithmetic, uproot3_methods.common.TH.Rebinning, uproot3_methods.base.ROOTMethods):
+    @property
+    def _arraytype(self):
+        return TH1
 
-class Methods(uproot3_methods.base.ROOTMethods):
     def __repr__(self):
         if self.name is None:
             return "<{0} at 0x{1:012x}>".format(self._classname, id(self))
         else:
             return "<{0} {1} 0x{2:012x}>".format(self._classname, repr(self._fName), id(self))
 
+    @property
+    def _axes(self):
+        return (self._fXaxis,)
+
     @property
     def name(self):
         return getattr(self, "_fName", None)
@@ -25,6 +34,9 @@ class Methods(uproot3_methods.base.ROOTMethods):
     def title(self):
         return self._fTitle
 
+    def lookup(self, x, errors=False, overflow="clamp"):
+        return uproot3_methods.common.TH.lookup(self, (x,), errors, overflow)
+
     @property
     def numbins(self):
         return self._fXaxis._fNbins
@@ -47,56 +59,28 @@ class Methods(uproot3_methods.base.ROOTMethods):
 
     @property
     def edges(self):
-        axis = self._fXaxis
-        if len(getattr(axis, "_fXbins", [])) > 0:
-            return numpy.array(axis._fXbins)
-        else:
-            return numpy.linspace(axis._fXmin, axis._fXmax, axis._fNbins + 1)
+        return uproot3_methods.common.TH.binning(self._fXaxis).edges
 
     @property
     def alledges(self):
-        axis = self._fXaxis
-        v = numpy.empty(axis._fNbins + 3)
-        v[0] = -numpy.inf
-        v[-1] = numpy.inf
-        v[1:-1] = self.edges
-        return v
+        return uproot3_methods.common.TH.binning(self._fXaxis).alledges
 
     @property
     def bins(self):
-        edges = self.edges
-        out = numpy.empty((len(edges) - 1, 2))
-        out[:, 0] = edges[:-1]
-        out[:, 1] = edges[1:]
-        return out
+        return uproot3_methods.common.TH.binning(self._fXaxis).bins
 
     @property
     def allbins(self):
-        edges = self.alledges
-        out = numpy.empty((len(edges) - 1, 2))
-        out[:, 0] = edges[:-1]
-        out[:, 1] = edges[1:]
-        return out
+        return uproot3_methods.common.TH.binning(self._fXaxis).allbins
 
     @property
     def values(self):
         return self.allvalues[1:-1]
 
-    @property
-    def allvalues(self):
-        return numpy.array(self, dtype=getattr(self, "_dtype", numpy.dtype(numpy.float64)).newbyteorder("="))
-
     @property
     def variances(self):
         return self.allvariances[1:-1]
 
-    @property
-    def allvariances(self):
-        if len(getattr(self, "_fSumw2", [])) != len(self):
-            return numpy.array(self, dtype=numpy.float64)
-        else:
-            return numpy.array(self._fSumw2, dtype=numpy.float64)
-
     def numpy(self):
         return self.values, self.edges
 
@@ -244,7 +228,7 @@ class Methods(uproot3_methods.base.ROOTMethods):
         import physt.binnings
         import physt.histogram1d
         freq = numpy.array(self.allvalues, dtype=getattr(self, "_dtype", numpy.dtype(numpy.float64)).newbyteorder("="))
-        if getattr(self._fXaxis, "_fXbins", None):
+        if len(getattr(self._fXaxis, "_fXbins", [])) > 0:
             binning = physt.binnings.NumpyBinning(numpy.array(self._fXaxis._fXbins))
         else:
             low = self._fXaxis._fXmin
@@ -266,7 +250,7 @@ class Methods(uproot3_methods.base.ROOTMethods):
             else:
                 independent["name"] = self._fTitle
 
-        if getattr(self._fXaxis, "_fXbins", None):
+        if len(getattr(self._fXaxis, "_fXbins", [])) > 0:
             independent_values = [{"low": float(low), "high": float(high)} for low, high in zip(self._fXaxis._fXbins[:-1], self._fXaxis._fXbins[1:])]
         else:
             low = self._fXaxis._fXmin
@@ -274,7 +258,7 @@ class Methods(uproot3_methods.base.ROOTMethods):
             norm = (high - low) / self._fXaxis._fNbins
             independent_values = [{"low": float(i*norm + low), "high": float((i + 1)*norm + low)} for i in range(self.numbins)]
 
-        if getattr(self, "_fSumw2", None):
+        if len(getattr(self, "_fSumw2", [])) > 0:
             dependent_values = [{"value": float(value), "errors": [{"symerror": math.sqrt(variance), "label": "stat"}]} for value, variance in zip(self.values, self.variances)]
         else:
             dependent_values = [{"value": float(value), "errors": [{"symerror": math.sqrt(value), "label": "stat"}]} for value in self.values]
@@ -288,7 +272,7 @@ class Methods(uproot3_methods.base.ROOTMethods):
             return yaml.dump(out, **yamloptions)
 
 def _histtype(content):
-    if issubclass(content.dtype.type, (numpy.bool_, numpy.bool)):
+    if issubclass(content.dtype.type, numpy.bool_):
         return b"TH1C", content.astype(">i1")
     elif issubclass(content.dtype.type, numpy.int8):
         return b"TH1C", content.astype(">i1")
@@ -313,24 +297,35 @@ def _histtype(content):
     else:
         return b"TH1D", content.astype(">f8")
 
-def from_numpy(histogram):
-    content, edges = histogram[:2]
+class TH1(uproot3_methods.common.TH.ArrayBacked, Methods):
+    def fill(self, values, weight=None, executor=None):
+        self._fill((values,), weight, executor)
 
-    class TH1(Methods, list):
-        pass
+class TH1Variations(uproot3_methods.common.TH.Variations):
+    _axisnames = ("_fXaxis",)
 
-    class TAxis(object):
-        def __init__(self, edges):
-            self._fNbins = len(edges) - 1
-            self._fXmin = edges[0]
-            self._fXmax = edges[-1]
-            if numpy.array_equal(edges, numpy.linspace(self._fXmin, self._fXmax, len(edges), dtype=edges.dtype)):
-                self._fXbins = numpy.array([], dtype=">f8")
-            else:
-                self._fXbins = edges.astype(">f8")
+    @property
+    def _histogramtype(self):
+        return TH1
+
+    def fill(self, values, weights):
+        self._fill((values,), weights)
+
+    def fill_bootstrap(self, values, eventnumbers, seed=0, weight=None):
+        self._fill_bootstrap((values,), eventnumbers, seed, weight)
+
+def _allcontents(content, underflow=0, overflow=0):
+    out = numpy.empty(len(content) + 2, dtype=content.dtype.newbyteorder("="))
+    out[1:-1] = content
+    out[0] = underflow
+    out[-1] = overflow
+    return out
+
+def from_numpy(histogram):
+    content, edges = histogram[:2]
 
     out = TH1.__new__(TH1)
-    out._fXaxis = TAxis(edges)
+    out._fXaxis = uproot3_methods.common.TH.TAxis.from_edges(edges)
 
     centers = (edges[:-1] + edges[1:]) / 2.0
     out._fEntries = out._fTsumw = out._fTsumw2 = content.sum()
@@ -344,14 +339,9 @@ def from_numpy(histogram):
 
     out._classname, content = _histtype(content)
 
-    valuesarray = numpy.empty(len(content) + 2, dtype=content.dtype)
-    valuesarray[1:-1] = content
-    valuesarray[0] = 0
-    valuesarray[-1] = 0
-
-    out.extend(valuesarray)
+    valuesarray = _allcontents(content)
     # variances equal the entries
-    out._fSumw2 = valuesarray
+    out._setarrays(valuesarray, valuesarray)
 
     return out
 
@@ -401,18 +391,8 @@ def from_pandas(histogram):
     edges[:-1] = dense.left
     edges[-1] = dense.right[-1]
 
-    class TH1(Methods, list):
-        pass
-
-    class TAxis(object):
-        def __init__(self, fNbins, fXmin, fXmax):
-            self._fNbins = fNbins
-            self._fXmin = fXmin
-            self._fXmax = fXmax
-
     out = TH1.__new__(TH1)
-    out._fXaxis = TAxis(len(edges) - 1, edges[0], edges[-1])
-    out._fXaxis._fXbins = edges
+    out._fXaxis = uproot3_methods.common.TH.TAxis(len(edges) - 1, edges[0], edges[-1], edges)
 
     centers = (edges[:-1] + edges[1:]) / 2.0
     out._fEntries = content.sum()
@@ -430,18 +410,10 @@ def from_pandas(histogram):
 
     out._classname, content = _histtype(content)
 
-    valuesarray = numpy.empty(len(content) + 2, dtype=content.dtype)
-    valuesarray[1:-1] = content
-    if len(underflowhist) == 0:
-        valuesarray[0] = 0
-    else:
-        valuesarray[0] = underflowhist["count"]
-    if len(overflowhist) == 0:
-        valuesarray[-1] = 0
-    else:
-        valuesarray[-1] = overflowhist["count"]
-
-    out.extend(valuesarray)
+    valuesarray = _allcontents(content,
+                               0 if len(underflowhist) == 0 else underflowhist["count"].iloc[0],
+                               0 if len(overflowhist) == 0 else overflowhist["count"].iloc[0])
+    out._setarrays(valuesarray, sumw2)
 
     return out
 
@@ -449,25 +421,16 @@ def from_physt(histogram):
     import physt.binnings
     import physt.histogram1d
 
-    class TH1(Methods, list):
-        pass
-
-    class TAxis(object):
-        def __init__(self, fNbins, fXmin, fXmax):
-            self._fNbins = fNbins
-            self._fXmin = fXmin
-            self._fXmax = fXmax
-
     out = TH1.__new__(TH1)
 
     if isinstance(histogram.binning, physt.binnings.FixedWidthBinning):
-        out._fXaxis = TAxis(histogram.binning.bin_count,
-                            histogram.binning.first_edge,
-                            histogram.binning.last_edge)
+        out._fXaxis = uproot3_methods.common.TH.TAxis(histogram.binning.bin_count,
+                                                      histogram.binning.first_edge,
+                                                      histogram.binning.last_edge)
     elif isinstance(histogram.binning, physt.binnings.NumpyBinning):
-        out._fXaxis = TAxis(histogram.binning.bin_count,
-                            histogram.binning.first_edge,
-                            histogram.binning.last_edge)
+        out._fXaxis = uproot3_methods.common.TH.TAxis(histogram.binning.bin_count,
+                                                      histogram.binning.first_edge,
+                                                      histogram.binning.last_edge)
         if not histogram.binning.is_regular():
             out._fXaxis._fXbins = histogram.binning.numpy_bins.astype(">f8")
     else:
@@ -476,7 +439,7 @@ def from_physt(histogram):
     centers = histogram.bin_centers
     content = histogram.frequencies
 
-    out._fSumw2 = [0] + list(histogram.errors2) + [0]
+    sumw2 = _allcontents(numpy.asarray(histogram.errors2, dtype=numpy.float64))
 
     mean = histogram.mean()
     variance = histogram.variance()
@@ -499,11 +462,7 @@ def from_physt(histogram):
 
     out._classname, content = _histtype(content)
 
-    valuesarray = numpy.empty(len(content) + 2, dtype=content.dtype)
-    valuesarray[1:-1] = content
-    valuesarray[0] = histogram.underflow
-    valuesarray[-1] = histogram.overflow
-
-    out.extend(valuesarray)
+    valuesarray = _allcontents(content, histogram.underflow, histogram.overflow)
+    out._setarrays(valuesarray, sumw2)
 
     return out
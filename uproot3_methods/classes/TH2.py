@@ -5,9 +5,21 @@
 import numpy
 
 import uproot3_methods.base
+import uproot3_methods.common.TH
 
 
-class Methods(uproot3_methods.base.ROOTMethods):
+class Methods(uproot3_methods.common.TH.ListBacked, uproot3_methods.common.TH.Arithmetic, uproot3_methods.common.TH.Rebinning, uproot3_methods.base.ROOTMethods):
+    @property
+    def _arraytype(self):
+        return TH2
+
+    @property
+    def _axes(self):
+        return (self._fXaxis, self._fYaxis)
+
+    def lookup(self, x, y, errors=False, overflow="clamp"):
+        return uproot3_methods.common.TH.lookup(self, (x, y), errors, overflow)
+
     @property
     def numbins(self):
         return self.xnumbins * self.ynumbins
@@ -76,79 +88,30 @@ class Methods(uproot3_methods.base.ROOTMethods):
 
     @property
     def edges(self):
-        xaxis = self._fXaxis
-        yaxis = self._fYaxis
-        if len(getattr(xaxis, "_fXbins", [])) > 0:
-            xedges = numpy.array(xaxis._fXbins)
-        else:
-            xedges = numpy.linspace(xaxis._fXmin, xaxis._fXmax, xaxis._fNbins + 1)
-        if len(getattr(yaxis, "_fXbins", [])) > 0:
-            yedges = numpy.array(yaxis._fXbins)
-        else:
-            yedges = numpy.linspace(yaxis._fXmin, yaxis._fXmax, yaxis._fNbins + 1)
-        return xedges, yedges
+        return tuple(uproot3_methods.common.TH.binning(x).edges for x in self._axes)
 
     @property
     def alledges(self):
-        xedges, yedges = self.edges
-        vx = numpy.empty(len(xedges) + 2)
-        vy = numpy.empty(len(yedges) + 2)
-        vx[0] = -numpy.inf
-        vx[-1] = numpy.inf
-        vx[1:-1] = xedges
-        vy[0] = -numpy.inf
-        vy[-1] = numpy.inf
-        vy[1:-1] = yedges
-        return vx, vy
+        return tuple(uproot3_methods.common.TH.binning(x).alledges for x in self._axes)
 
     @property
     def bins(self):
-        xedges, yedges = self.edges
-        vx = numpy.empty((len(xedges) - 1, 2))
-        vy = numpy.empty((len(yedges) - 1, 2))
-        vx[:, 0] = xedges[:-1]
-        vx[:, 1] = xedges[1:]
-        vy[:, 0] = yedges[:-1]
-        vy[:, 1] = yedges[1:]
-        return vx, vy
+        return tuple(uproot3_methods.common.TH.binning(x).bins for x in self._axes)
 
     @property
     def allbins(self):
-        xedges, yedges = self.alledges
-        vx = numpy.empty((len(xedges) - 1, 2))
-        vy = numpy.empty((len(yedges) - 1, 2))
-        vx[:, 0] = xedges[:-1]
-        vx[:, 1] = xedges[1:]
-        vy[:, 0] = yedges[:-1]
-        vy[:, 1] = yedges[1:]
-        return vx, vy
+        return tuple(uproot3_methods.common.TH.binning(x).allbins for x in self._axes)
 
     @property
     def values(self):
         va = self.allvalues
         return va[1:self.xnumbins+1, 1:self.ynumbins+1]
 
-    @property
-    def allvalues(self):
-        dtype = getattr(self, "_dtype", numpy.dtype(numpy.float64))
-        v = numpy.array(self[:], dtype=dtype.newbyteorder("="))
-        v = v.reshape(self.ynumbins + 2, self.xnumbins + 2)
-        return v.T
-
     @property
     def variances(self):
         va = self.allvariances
         return va[1:self.xnumbins+1, 1:self.ynumbins+1]
 
-    @property
-    def allvariances(self):
-        if len(getattr(self, "_fSumw2", [])) != len(self):
-            v = numpy.array(self, dtype=numpy.float64)
-        else:
-            v = numpy.array(self._fSumw2, dtype=numpy.float64)
-        v = v.reshape(self.ynumbins + 2, self.xnumbins + 2)
-        return v.T
-
     def numpy(self):
         return (self.values, [self.edges])
 
@@ -177,7 +140,7 @@ class Methods(uproot3_methods.base.ROOTMethods):
         elif index == nbins + 1:
             return high, float("inf")
         else:
-            if not bins:
+            if len(bins) == 0:
                 norm = float(high-low) / nbins
                 xedges = (index-1)*norm + low, index*norm + low
             else:
@@ -197,8 +160,25 @@ class Methods(uproot3_methods.base.ROOTMethods):
         else:
             return [str(x) for x in self._fYaxis._fLabels]
 
+class TH2(uproot3_methods.common.TH.ArrayBacked, Methods):
+    def fill(self, x, y, weight=None, executor=None):
+        self._fill((x, y), weight, executor)
+
+class TH2Variations(uproot3_methods.common.TH.Variations):
+    _axisnames = ("_fXaxis", "_fYaxis")
+
+    @property
+    def _histogramtype(self):
+        return TH2
+
+    def fill(self, x, y, weights):
+        self._fill((x, y), weights)
+
+    def fill_bootstrap(self, x, y, eventnumbers, seed=0, weight=None):
+        self._fill_bootstrap((x, y), eventnumbers, seed, weight)
+
 def _histtype(content):
-    if issubclass(content.dtype.type, (numpy.bool_, numpy.bool)):
+    if issubclass(content.dtype.type, numpy.bool_):
         return b"TH2C", content.astype(">i1")
     elif issubclass(content.dtype.type, numpy.int8):
         return b"TH2C", content.astype(">i1")
@@ -229,22 +209,9 @@ def from_numpy(histogram):
     else:
         content, xedges, yedges = histogram[:3]
 
-    class TH2(Methods, list):
-        pass
-
-    class TAxis(object):
-        def __init__(self, edges):
-            self._fNbins = len(edges) - 1
-            self._fXmin = edges[0]
-            self._fXmax = edges[-1]
-            if numpy.array_equal(edges, numpy.linspace(self._fXmin, self._fXmax, len(edges), dtype=edges.dtype)):
-                self._fXbins = numpy.array([], dtype=">f8")
-            else:
-                self._fXbins = edges.astype(">f8")
-
     out = TH2.__new__(TH2)
-    out._fXaxis = TAxis(xedges)
-    out._fYaxis = TAxis(yedges)
+    out._fXaxis = uproot3_methods.common.TH.TAxis.from_edges(xedges)
+    out._fYaxis = uproot3_methods.common.TH.TAxis.from_edges(yedges)
     out._fEntries = out._fTsumw = out._fTsumw2 = content.sum()
 
     xcenters = (xedges[:-1] + xedges[1:]) / 2.
@@ -265,8 +232,6 @@ def from_numpy(histogram):
     out._classname, content = _histtype(content)
 
     valuesarray = numpy.pad(content.T, (1, 1), mode='constant').flatten()
-
-    out.extend(valuesarray)
-    out._fSumw2 = valuesarray**2
+    out._setarrays(valuesarray, valuesarray**2)
 
     return out
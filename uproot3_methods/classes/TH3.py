@@ -5,9 +5,21 @@
 import numpy
 
 import uproot3_methods.base
+import uproot3_methods.common.TH
 
 
-class Methods(uproot3_methods.base.ROOTMethods):
+class Methods(uproot3_methods.common.TH.ListBacked, uproot3_methods.common.TH.Arithmetic, uproot3_methods.common.TH.Rebinning, uproot3_methods.base.ROOTMethods):
+    @property
+    def _arraytype(self):
+        return TH3
+
+    @property
+    def _axes(self):
+        return (self._fXaxis, self._fYaxis, self._fZaxis)
+
+    def lookup(self, x, y, z, errors=False, overflow="clamp"):
+        return uproot3_methods.common.TH.lookup(self, (x, y, z), errors, overflow)
+
     @property
     def numbins(self):
         return self.xnumbins * self.ynumbins * self.znumbins
@@ -98,100 +110,30 @@ class Methods(uproot3_methods.base.ROOTMethods):
 
     @property
     def edges(self):
-        xaxis = self._fXaxis
-        yaxis = self._fYaxis
-        zaxis = self._fZaxis
-        if len(getattr(xaxis, "_fXbins", [])) > 0:
-            xedges = numpy.array(xaxis._fXbins)
-        else:
-            xedges = numpy.linspace(xaxis._fXmin, xaxis._fXmax,
-                                    xaxis._fNbins + 1)
-
-        if len(getattr(yaxis, "_fXbins", [])) > 0:
-            yedges = numpy.array(yaxis._fXbins)
-        else:
-            yedges = numpy.linspace(yaxis._fXmin, yaxis._fXmax,
-                                    yaxis._fNbins + 1)
-
-        if len(getattr(zaxis, "_fXbins", [])) > 0:
-            zedges = numpy.array(zaxis._fXbins)
-        else:
-            zedges = numpy.linspace(zaxis._fXmin, zaxis._fXmax,
-                                    zaxis._fNbins + 1)
-
-        return xedges, yedges, zedges
+        return tuple(uproot3_methods.common.TH.binning(x).edges for x in self._axes)
 
     @property
     def alledges(self):
-        xedges, yedges, zedges = self.edges
-        vx = numpy.empty(len(xedges) + 2)
-        vy = numpy.empty(len(yedges) + 2)
-        vz = numpy.empty(len(zedges) + 2)
-        vx[0] = -numpy.inf
-        vx[-1] = numpy.inf
-        vx[1:-1] = xedges
-        vy[0] = -numpy.inf
-        vy[-1] = numpy.inf
-        vy[1:-1] = yedges
-        vz[0] = -numpy.inf
-        vz[-1] = numpy.inf
-        vz[1:-1] = zedges
-        return vx, vy, vz
+        return tuple(uproot3_methods.common.TH.binning(x).alledges for x in self._axes)
 
     @property
     def bins(self):
-        xedges, yedges, zedges = self.edges
-        vx = numpy.empty((len(xedges) - 1, 2))
-        vy = numpy.empty((len(yedges) - 1, 2))
-        vz = numpy.empty((len(zedges) - 1, 2))
-        vx[:, 0] = xedges[:-1]
-        vx[:, 1] = xedges[1:]
-        vy[:, 0] = yedges[:-1]
-        vy[:, 1] = yedges[1:]
-        vz[:, 0] = zedges[:-1]
-        vz[:, 1] = zedges[1:]
-        return vx, vy, vz
+        return tuple(uproot3_methods.common.TH.binning(x).bins for x in self._axes)
 
     @property
     def allbins(self):
-        xedges, yedges, zedges = self.alledges
-        vx = numpy.empty((len(xedges) - 1, 2))
-        vy = numpy.empty((len(yedges) - 1, 2))
-        vz = numpy.empty((len(zedges) - 1, 2))
-        vx[:, 0] = xedges[:-1]
-        vx[:, 1] = xedges[1:]
-        vy[:, 0] = yedges[:-1]
-        vy[:, 1] = yedges[1:]
-        vz[:, 0] = zedges[:-1]
-        vz[:, 1] = zedges[1:]
-        return vx, vy, vz
+        return tuple(uproot3_methods.common.TH.binning(x).allbins for x in self._axes)
 
     @property
     def values(self):
         va = self.allvalues
         return va[1:self.xnumbins+1, 1:self.ynumbins+1, 1:self.znumbins+1]
 
-    @property
-    def allvalues(self):
-        dtype = getattr(self, "_dtype", numpy.dtype(numpy.float64))
-        v = numpy.array(self[:], dtype=dtype.newbyteorder("="))
-        v = v.reshape(self.znumbins + 2, self.ynumbins + 2, self.xnumbins + 2)
-        return v.T
-
     @property
     def variances(self):
         va = self.allvariances
         return va[1:self.xnumbins+1, 1:self.ynumbins+1, 1:self.znumbins+1]
 
-    @property
-    def allvariances(self):
-        if len(getattr(self, "_fSumw2", [])) != len(self):
-            v = numpy.array(self, dtype=numpy.float64)
-        else:
-            v = numpy.array(self._fSumw2, dtype=numpy.float64)
-        v = v.reshape(self.znumbins + 2, self.ynumbins + 2, self.xnumbins + 2)
-        return v.T
-
     def numpy(self):
         return (self.values, [self.edges])
 
@@ -225,7 +167,7 @@ class Methods(uproot3_methods.base.ROOTMethods):
         elif index == nbins + 1:
             return high, float("inf")
         else:
-            if not bins:
+            if len(bins) == 0:
                 norm = float(high-low) / nbins
                 xedges = (index-1)*norm + low, index*norm + low
             else:
@@ -254,3 +196,86 @@ class Methods(uproot3_methods.base.ROOTMethods):
             return None
         else:
             return [str(x) for x in self._fZaxis._fLabels]
+
+class TH3(uproot3_methods.common.TH.ArrayBacked, Methods):
+    def fill(self, x, y, z, weight=None, executor=None):
+        self._fill((x, y, z), weight, executor)
+
+class TH3Variations(uproot3_methods.common.TH.Variations):
+    _axisnames = ("_fXaxis", "_fYaxis", "_fZaxis")
+
+    @property
+    def _histogramtype(self):
+        return TH3
+
+    def fill(self, x, y, z, weights):
+        self._fill((x, y, z), weights)
+
+    def fill_bootstrap(self, x, y, z, eventnumbers, seed=0, weight=None):
+        self._fill_bootstrap((x, y, z), eventnumbers, seed, weight)
+
+def _histtype(content):
+    if issubclass(content.dtype.type, numpy.bool_):
+        return b"TH3C", content.astype(">i1")
+    elif issubclass(content.dtype.type, numpy.int8):
+        return b"TH3C", content.astype(">i1")
+    elif issubclass(content.dtype.type, numpy.uint8) and content.max() <= numpy.iinfo(numpy.int8).max:
+        return b"TH3C", content.astype(">i1")
+    elif issubclass(content.dtype.type, numpy.uint8):
+        return b"TH3S", content.astype(">i2")
+    elif issubclass(content.dtype.type, numpy.int16):
+        return b"TH3S", content.astype(">i2")
+    elif issubclass(content.dtype.type, numpy.uint16) and content.max() <= numpy.iinfo(numpy.int16).max:
+        return b"TH3S", content.astype(">i2")
+    elif issubclass(content.dtype.type, numpy.uint16):
+        return b"TH3I", content.astype(">i4")
+    elif issubclass(content.dtype.type, numpy.int32):
+        return b"TH3I", content.astype(">i4")
+    elif issubclass(content.dtype.type, numpy.uint32) and content.max() <= numpy.iinfo(numpy.int32).max:
+        return b"TH3I", content.astype(">i4")
+    elif issubclass(content.dtype.type, numpy.integer) and numpy.iinfo(numpy.int32).min <= content.min() and content.max() <= numpy.iinfo(numpy.int32).max:
+        return b"TH3I", content.astype(">i4")
+    elif issubclass(content.dtype.type, numpy.float32):
+        return b"TH3F", content.astype(">f4")
+    else:
+        return b"TH3D", content.astype(">f8")
+
+def from_numpy(histogram):
+    if isinstance(histogram[1], list) and len(histogram[1]) == 3:
+        content, (xedges, yedges, zedges) = histogram[:2]
+    else:
+        content, xedges, yedges, zedges = histogram[:4]
+
+    out = TH3.__new__(TH3)
+    out._fXaxis = uproot3_methods.common.TH.TAxis.from_edges(xedges)
+    out._fYaxis = uproot3_methods.common.TH.TAxis.from_edges(yedges)
+    out._fZaxis = uproot3_methods.common.TH.TAxis.from_edges(zedges)
+    out._fEntries = out._fTsumw = out._fTsumw2 = content.sum()
+
+    xcenters = (xedges[:-1] + xedges[1:]) / 2.
+    ycenters = (yedges[:-1] + yedges[1:]) / 2.
+    zcenters = (zedges[:-1] + zedges[1:]) / 2.
+    xcontent = content.sum((1, 2))
+    ycontent = content.sum((0, 2))
+    zcontent = content.sum((0, 1))
+    out._fTsumwx = xcenters.dot(xcontent)
+    out._fTsumwx2 = (xcenters**2).dot(xcontent)
+    out._fTsumwy = ycenters.dot(ycontent)
+    out._fTsumwy2 = (ycenters**2).dot(ycontent)
+    out._fTsumwz = zcenters.dot(zcontent)
+    out._fTsumwz2 = (zcenters**2).dot(zcontent)
+    out._fTsumwxy = xcenters.dot(content.sum(2)).dot(ycenters)
+    out._fTsumwxz = xcenters.dot(content.sum(1)).dot(zcenters)
+    out._fTsumwyz = ycenters.dot(content.sum(0)).dot(zcenters)
+
+    if len(histogram) >= 5:
+        out._fTitle = histogram[4]
+    else:
+        out._fTitle = b""
+
+    out._classname, content = _histtype(content)
+
+    valuesarray = numpy.pad(content.T, (1, 1), mode='constant').flatten()
+    out._setarrays(valuesarray, valuesarray)
+
+    return out
@@ -12,10 +12,17 @@ import awkward0.array.objects
 import awkward0.util
 
 import uproot3_methods.base
+import uproot3_methods.common.approx
+import uproot3_methods.common.kernels
+import uproot3_methods.common.parallel
+import uproot3_methods.common.records
+import uproot3_methods.common.reduction
 import uproot3_methods.common.TVector
 import uproot3_methods.classes.TVector3
 
 class Common(object):
+    __slots__ = ()
+
     @property
     def E(self):
         return self.t
@@ -135,26 +142,10 @@ class ArrayMethods(Common, uproot3_methods.base.ROOTMethods):
             serializer(z, "TLorentzVectorArray.z"),
             serializer(t, "TLorentzVectorArray.t"))
 
-    @staticmethod
-    def _wrapmethods(node, awkwardlib):
-        if isinstance(node, awkward0.array.chunked.ChunkedArray):
-            node.__class__ = type("ChunkedArrayMethods", (awkwardlib.ChunkedArray, uproot3_methods.classes.TVector3.ArrayMethods), {})
-            for chunk in node.chunks:
-                ArrayMethods._wrapmethods(chunk, awkwardlib)
-        elif isinstance(node, awkward0.array.jagged.JaggedArray):
-            node.__class__ = type("JaggedArrayMethods", (awkwardlib.JaggedArray, uproot3_methods.classes.TVector3.ArrayMethods), {})
-            ArrayMethods._wrapmethods(node.content, awkwardlib)
-        elif isinstance(node, awkward0.array.objects.ObjectArray):
-            node.__class__ = type("ObjectArrayMethods", (awkwardlib.ObjectArray, uproot3_methods.classes.TVector3.ArrayMethods), {})
-
     @property
+    @uproot3_methods.common.parallel.chunkwise
     def p3(self):
-        out = self.empty_like(generator=lambda row: uproot3_methods.classes.TVector3.TVector3(row["fX"], row["fY"], row["fZ"]))
-        ArrayMethods._wrapmethods(out, self.awkward0)
-        out["fX"] = self.x
-        out["fY"] = self.y
-        out["fZ"] = self.z
-        return out
+        return uproot3_methods.classes.TVector3.TVector3Array.from_cartesian(self.x, self.y, self.z)
 
     @property
     def x(self):
@@ -173,40 +164,61 @@ class ArrayMethods(Common, uproot3_methods.base.ROOTMethods):
         return self["fE"]
 
     @property
+    @uproot3_methods.common.parallel.chunkwise
     def pt(self):
         return self._trymemo("pt", lambda self: self.awkward0.numpy.sqrt(self.pt2))
 
     @property
+    @uproot3_methods.common.parallel.chunkwise
     def eta(self):
+        if uproot3_methods.common.approx.enabled:
+            return self._trymemo("approx_eta", lambda self: uproot3_methods.common.approx.eta(self.x, self.y, self.z))
         return self._trymemo("eta", lambda self: self.awkward0.numpy.arcsinh(self.z / self.awkward0.numpy.sqrt(self.x**2 + self.y**2)))
 
     @property
+    @uproot3_methods.common.parallel.chunkwise
     def phi(self):
+        if uproot3_methods.common.approx.enabled:
+            return self._trymemo("approx_phi", lambda self: uproot3_methods.common.approx.phi(self.x, self.y))
         return self._trymemo("phi", lambda self: self.p3.phi)
 
     @property
+    @uproot3_methods.common.parallel.chunkwise
     def mass(self):
-        return self._trymemo("mass", lambda self: self.awkward0.numpy.sqrt(self.mag2))
+        if uproot3_methods.common.approx.enabled:
+            return self._trymemo("approx_mass", lambda self: uproot3_methods.common.approx.mass(self.x, self.y, self.z, self.t))
+        return self._trymemo("mass", lambda self: self._mass())
+
+    def _mass(self):
+        if uproot3_methods.common.kernels.enabled:
+            out = uproot3_methods.common.kernels.mass(self.x, self.y, self.z, self.t)
+            if out is not None:
+                return out
+        return self.awkward0.numpy.sqrt(self.mag2)
 
     @property
     def mag(self):
         return self.awkward0.numpy.sqrt(self.mag2)
 
     @property
+    @uproot3_methods.common.parallel.chunkwise
     def mt(self):
         mt2 = self.mt2
         sign = self.awkward0.numpy.sign(mt2)
         return self.awkward0.numpy.sqrt(self.awkward0.numpy.absolute(mt2)) * sign
 
     @property
+    @uproot3_methods.common.parallel.chunkwise
     def rapidity(self):
         return 0.5 * self.awkward0.numpy.log((self.t + self.z) / (self.t - self.z))
 
     @property
+    @uproot3_methods.common.parallel.chunkwise
     def unit(self):
         return self / self.awkward0.numpy.sqrt(self.mag)
 
     @property
+    @uproot3_methods.common.parallel.chunkwise
     def boostp3(self):
         out = self.empty_like(generator=lambda row: uproot3_methods.classes.TVector3.TVector3(row["fX"], row["fY"], row["fZ"]))
         if isinstance(self, self.awkward0.JaggedArray):
@@ -218,10 +230,18 @@ class ArrayMethods(Common, uproot3_methods.base.ROOTMethods):
         out["fZ"] = self.z / self.t
         return out
 
+    @uproot3_methods.common.parallel.chunkwise
     def boost(self, p3):
         if not isinstance(p3, (uproot3_methods.classes.TVector3.ArrayMethods, uproot3_methods.classes.TVector3.Methods)):
             raise TypeError("boost p3 must be an (array of) TVector3")
 
+        if uproot3_methods.common.kernels.enabled:
+            boosted = uproot3_methods.common.kernels.boost(self.x, self.y, self.z, self.t, p3.x, p3.y, p3.z)
+            if boosted is not None:
+                out = self.empty_like()
+                out["fX"], out["fY"], out["fZ"], out["fE"] = boosted
+                return out
+
         b2 = p3.mag2
         gamma = (1 - b2)**(-0.5)
         gamma2 = self.awkward0.numpy.zeros(b2.shape, dtype=self.awkward0.numpy.float64)
@@ -240,6 +260,7 @@ class ArrayMethods(Common, uproot3_methods.base.ROOTMethods):
         return out
 
     @property
+    @uproot3_methods.common.parallel.chunkwise
     def gamma(self):
         out = self.beta
         mask = (out < 1) & (out > -1)
@@ -247,11 +268,21 @@ class ArrayMethods(Common, uproot3_methods.base.ROOTMethods):
         out[~mask] = self.awkward0.numpy.inf
         return out
 
+    @uproot3_methods.common.parallel.chunkwise
     def delta_r(self, other):
+        if uproot3_methods.common.kernels.enabled:
+            out = uproot3_methods.common.kernels.delta_r(self.eta, self.phi, other.eta, other.phi)
+            if out is not None:
+                return out
         return self.awkward0.numpy.sqrt(self.delta_r2(other))
 
+    @uproot3_methods.common.parallel.chunkwise
     def rotate_axis(self, axis, angle):
-        p3, t = self._rotate_axis(axis, angle)
+        p3 = None
+        if uproot3_methods.common.kernels.enabled and isinstance(axis, uproot3_methods.classes.TVector3.Common):
+            p3, t = uproot3_methods.common.kernels.rotate_axis(self.x, self.y, self.z, axis.x, axis.y, axis.z, angle), self.t
+        if p3 is None:
+            p3, t = self._rotate_axis(axis, angle)
         x, y, z = p3
         out = self.empty_like()
         out["fX"] = x
@@ -260,6 +291,7 @@ class ArrayMethods(Common, uproot3_methods.base.ROOTMethods):
         out["fE"] = t
         return out
 
+    @uproot3_methods.common.parallel.chunkwise
     def rotate_euler(self, phi=0, theta=0, psi=0):
         p3, t = self._rotate_euler(phi, theta, psi)
         x, y, z = p3
@@ -274,10 +306,11 @@ class ArrayMethods(Common, uproot3_methods.base.ROOTMethods):
         return self.awkward0.numpy.absolute(self.mag2) < tolerance
 
     def sum(self):
-        if isinstance(self, awkward0.AwkwardArray) and self._util_hasjagged(self):
-            return TLorentzVectorArray.from_cartesian(self.x.sum(), self.y.sum(), self.z.sum(), self.t.sum())
+        jagged, sums = uproot3_methods.common.reduction.componentsums(self, ("x", "y", "z", "t"))
+        if jagged:
+            return TLorentzVectorArray.from_cartesian(*sums)
         else:
-            return TLorentzVector(self.x.sum(), self.y.sum(), self.z.sum(), self.t.sum())
+            return TLorentzVector(*sums)
 
     def _to_cartesian(self):
         return TLorentzVectorArray.from_cartesian(self.x,self.y,self.z,self.t)
@@ -289,22 +322,17 @@ class ArrayMethods(Common, uproot3_methods.base.ROOTMethods):
         if method != "__call__":
             return NotImplemented
 
-        inputs = list(inputs)
-        for i in range(len(inputs)):
-            if isinstance(inputs[i], self.awkward0.numpy.ndarray) and inputs[i].dtype == self.awkward0.numpy.dtype(object) and len(inputs[i]) > 0:
-                idarray = self.awkward0.numpy.frombuffer(inputs[i], dtype=self.awkward0.numpy.uintp)
-                if (idarray == idarray[0]).all():
-                    inputs[i] = inputs[i][0]
+        inputs = [uproot3_methods.base._unbroadcast(x) for x in inputs]
 
         if ufunc is self.awkward0.numpy.add or ufunc is self.awkward0.numpy.subtract:
             if not all(isinstance(x, (ArrayMethods, Methods)) for x in inputs):
                 raise TypeError("(arrays of) TLorentzVector can only be added to/subtracted from other (arrays of) TLorentzVector")
             cart_inputs = [x._to_cartesian() for x in inputs]
-            out = cart_inputs[0].empty_like()
-            out["fX"] = getattr(ufunc, method)(*[x.x for x in cart_inputs], **kwargs)
-            out["fY"] = getattr(ufunc, method)(*[x.y for x in cart_inputs], **kwargs)
-            out["fZ"] = getattr(ufunc, method)(*[x.z for x in cart_inputs], **kwargs)
-            out["fE"] = getattr(ufunc, method)(*[x.t for x in cart_inputs], **kwargs)
+            out = [x for x in cart_inputs if isinstance(x, ArrayMethods)][0].empty_like()
+            out["fX"] = uproot3_methods.common.kernels.apply(ufunc, [x.x for x in cart_inputs], kwargs)
+            out["fY"] = uproot3_methods.common.kernels.apply(ufunc, [x.y for x in cart_inputs], kwargs)
+            out["fZ"] = uproot3_methods.common.kernels.apply(ufunc, [x.z for x in cart_inputs], kwargs)
+            out["fE"] = uproot3_methods.common.kernels.apply(ufunc, [x.t for x in cart_inputs], kwargs)
             return out
 
         elif ufunc is self.awkward0.numpy.power and len(inputs) >= 2 and isinstance(inputs[1], (numbers.Number, self.awkward0.numpy.number)):
@@ -336,18 +364,22 @@ class PtEtaPhiMassArrayMethods(ArrayMethods):
             serializer(mass, "TLorentzVectorArray.mass"))
 
     @property
+    @uproot3_methods.common.parallel.chunkwise
     def x(self):
         return self._trymemo("x",lambda self: self.pt * self.awkward0.numpy.cos(self.phi))
 
     @property
+    @uproot3_methods.common.parallel.chunkwise
     def y(self):
         return self._trymemo("y",lambda self: self.pt * self.awkward0.numpy.sin(self.phi))
 
     @property
+    @uproot3_methods.common.parallel.chunkwise
     def z(self):
         return self._trymemo("z",lambda self: self.pt * self.awkward0.numpy.sinh(self.eta))
 
     @property
+    @uproot3_methods.common.parallel.chunkwise
     def t(self):
         return self._trymemo("t",lambda self: self.awkward0.numpy.hypot(self.mass, self.p))
 
@@ -392,6 +424,7 @@ class PtEtaPhiMassArrayMethods(ArrayMethods):
         return self["fMass"]**2
 
     @property
+    @uproot3_methods.common.parallel.chunkwise
     def mt(self):
         return self.awkward0.numpy.sqrt(self.mt2)
 
@@ -414,12 +447,7 @@ class PtEtaPhiMassArrayMethods(ArrayMethods):
         if method != "__call__":
             return NotImplemented
 
-        inputs = list(inputs)
-        for i in range(len(inputs)):
-            if isinstance(inputs[i], self.awkward0.numpy.ndarray) and inputs[i].dtype == self.awkward0.numpy.dtype(object) and len(inputs[i]) > 0:
-                idarray = self.awkward0.numpy.frombuffer(inputs[i], dtype=self.awkward0.numpy.uintp)
-                if (idarray == idarray[0]).all():
-                    inputs[i] = inputs[i][0]
+        inputs = [uproot3_methods.base._unbroadcast(x) for x in inputs]
 
         if ufunc is self.awkward0.numpy.multiply or ufunc is self.awkward0.numpy.divide:
             if sum(isinstance(x, PtEtaPhiMassArrayMethods) for x in inputs) > 1:
@@ -443,6 +471,7 @@ class PtEtaPhiMassArrayMethods(ArrayMethods):
 PtEtaPhiMassJaggedArrayMethods = PtEtaPhiMassArrayMethods.mixin(PtEtaPhiMassArrayMethods, awkward0.JaggedArray)
 
 class Methods(Common, uproot3_methods.base.ROOTMethods):
+    __slots__ = ()
     _arraymethods = ArrayMethods
 
     @property
@@ -469,7 +498,7 @@ class Methods(Common, uproot3_methods.base.ROOTMethods):
         return TLorentzVector(self.x,self.y,self.z,self.t)
 
     def __repr__(self):
-        return "TLorentzVector(x={0:.5g}, y={1:.5g}, z={2:.5g}, t={3:.5g})".format(self._fP._fX, self._fP._fY, self._fP._fZ, self._fE)
+        return "TLorentzVector(x={0:.5g}, y={1:.5g}, z={2:.5g}, t={3:.5g})".format(self.x, self.y, self.z, self.t)
 
     def __str__(self):
         return repr(self)
@@ -478,26 +507,25 @@ class Methods(Common, uproot3_methods.base.ROOTMethods):
         return isinstance(other, Methods) and self.x == other.x and self.y == other.y and self.z == other.z and self.t == other.t
 
     def _scalar(self, operator, scalar, reverse=False):
-        cart = self._to_cartesian()
         if not isinstance(scalar, (numbers.Number, self.awkward0.numpy.number)):
             raise TypeError("cannot {0} a TLorentzVector with a {1}".format(operator.__name__, type(scalar).__name__))
         if reverse:
-            return TLorentzVector(operator(scalar, cart.x), operator(scalar, cart.y), operator(scalar, cart.z), operator(scalar, cart.t))
+            return TLorentzVector(operator(scalar, self.x), operator(scalar, self.y), operator(scalar, self.z), operator(scalar, self.t))
         else:
-            return TLorentzVector(operator(cart.x, scalar), operator(cart.y, scalar), operator(cart.z, scalar), operator(cart.t, scalar))
+            return TLorentzVector(operator(self.x, scalar), operator(self.y, scalar), operator(self.z, scalar), operator(self.t, scalar))
 
     def _vector(self, operator, vector, reverse=False):
-        cart = self._to_cartesian()
+        if isinstance(vector, (self.awkward0.AwkwardArray, self.awkward0.numpy.ndarray)):
+            return NotImplemented
         if not isinstance(vector, Methods):
             raise TypeError("cannot {0} a TLorentzVector with a {1}".format(operator.__name__, type(vector).__name__))
         if reverse:
-            return TLorentzVector(operator(vector.x, cart.x), operator(vector.y, cart.y), operator(vector.z, cart.z), operator(vector.t, cart.t))
+            return TLorentzVector(operator(vector.x, self.x), operator(vector.y, self.y), operator(vector.z, self.z), operator(vector.t, self.t))
         else:
-            return TLorentzVector(operator(cart.x, vector.x), operator(cart.y, vector.y), operator(cart.z, vector.z), operator(cart.t, vector.t))
+            return TLorentzVector(operator(self.x, vector.x), operator(self.y, vector.y), operator(self.z, vector.z), operator(self.t, vector.t))
 
     def _unary(self, operator):
-        cart = self._to_cartesian()
-        return TLorentzVector(operator(cart.x), operator(cart.y), operator(cart.z), operator(cart.t))
+        return TLorentzVector(operator(self.x), operator(self.y), operator(self.z), operator(self.t))
 
     @property
     def pt(self):
@@ -680,6 +708,7 @@ class Methods(Common, uproot3_methods.base.ROOTMethods):
         return self._unary(operator.invert)
 
 class PtEtaPhiMassMethods(Methods):
+    __slots__ = ()
     _arraymethods = PtEtaPhiMassArrayMethods
 
     @property
@@ -856,6 +885,43 @@ class TLorentzVectorArray(ArrayMethods, uproot3_methods.base.ROOTMethods.awkward
     def from_ptetaphim(cls, pt, eta, phi, mass):
         return PtEtaPhiMassLorentzVectorArray(pt,eta,phi,mass)
 
+    @classmethod
+    def from_objects(cls, objects):
+        counts, objects = uproot3_methods.common.records.flatten(objects)
+        if len(objects) > 0 and all(isinstance(x, PtEtaPhiMassLorentzVector) for x in objects):
+            return cls.from_ptetaphim(*uproot3_methods.common.records.components(objects, ("pt", "eta", "phi", "mass"), counts))
+        else:
+            return cls.from_cartesian(*uproot3_methods.common.records.components(objects, ("x", "y", "z", "t"), counts))
+
+    _cartesianfields = (("fX", "fY", "fZ", "fE"), ("x", "y", "z", "t"), ("px", "py", "pz", "E"), ("px", "py", "pz", "e"))
+    _ptetaphimfields = (("fPt", "fEta", "fPhi", "fMass"), ("pt", "eta", "phi", "mass"), ("pt", "eta", "phi", "m"))
+
+    @classmethod
+    def from_records(cls, records, dtype=None, names=None, coordinates=None):
+        """Wraps record fields as (x, y, z, t) if coordinates is "cartesian" or (pt, eta, phi, mass) if "ptetaphim"; if None, names must be a known spelling of one of them."""
+        if coordinates not in (None, "cartesian", "ptetaphim"):
+            raise ValueError("coordinates must be None, \"cartesian\", or \"ptetaphim\"")
+        if coordinates is None:
+            candidates = cls._cartesianfields + cls._ptetaphimfields
+        elif coordinates == "cartesian":
+            candidates = cls._cartesianfields
+        else:
+            candidates = cls._ptetaphimfields
+        names, columns = uproot3_methods.common.records.fields(records, candidates, dtype, names)
+
+        if coordinates is None:
+            if names in cls._ptetaphimfields:
+                coordinates = "ptetaphim"
+            elif names in cls._cartesianfields:
+                coordinates = "cartesian"
+            else:
+                raise ValueError("cannot tell the coordinate system of fields {0}; pass coordinates=\"cartesian\" or \"ptetaphim\"".format(names))
+
+        if coordinates == "ptetaphim":
+            return cls.from_ptetaphim(*columns)
+        else:
+            return cls.from_cartesian(*columns)
+
     @property
     def x(self):
         return self["fX"]
@@ -897,6 +963,8 @@ class TLorentzVectorArray(ArrayMethods, uproot3_methods.base.ROOTMethods.awkward
         self["fE"] = value
 
 class PtEtaPhiMassLorentzVector(PtEtaPhiMassMethods):
+    __slots__ = ("_fPt", "_fEta", "_fPhi", "_fMass")
+
     def __init__(self, pt, eta, phi, mass):
         self._fPt   = float(pt)
         self._fEta  = float(eta)
@@ -935,9 +1003,29 @@ class PtEtaPhiMassLorentzVector(PtEtaPhiMassMethods):
     def mass(self, value):
         self._fMass = value
 
+class _SpatialPart(uproot3_methods.classes.TVector3.TVector3):
+    # the TVector3 fP of a TLorentzVector as a view: reading and assigning x, y, z goes to the parent's flat storage
+    __slots__ = ("_parent",)
+
+    def __init__(self, parent):
+        self._parent = parent
+
+    def _component(name):
+        return property(lambda self: getattr(self._parent, name), lambda self, value: setattr(self._parent, name, value))
+
+    _fX = _component("_fX")
+    _fY = _component("_fY")
+    _fZ = _component("_fZ")
+    del _component
+
 class TLorentzVector(Methods):
+    # flat storage; ROOT's nested TVector3 fP is a view of it, built on request
+    __slots__ = ("_fX", "_fY", "_fZ", "_fE")
+
     def __init__(self, x, y, z, t):
-        self._fP = uproot3_methods.classes.TVector3.TVector3(float(x), float(y), float(z))
+        self._fX = float(x)
+        self._fY = float(y)
+        self._fZ = float(z)
         self._fE = float(t)
 
     @classmethod
@@ -946,10 +1034,7 @@ class TLorentzVector(Methods):
 
     @classmethod
     def from_p3(cls, p3, t):
-        out = cls.__new__(cls)
-        out._fP = p3
-        out._fE = t
-        return out
+        return cls(p3.x, p3.y, p3.z, t)
 
     @classmethod
     def from_spherical(cls, r, theta, phi, t):
@@ -978,29 +1063,41 @@ class TLorentzVector(Methods):
     def from_ptetaphim(cls, pt, eta, phi, mass):
         return PtEtaPhiMassLorentzVector(pt,eta,phi,mass)
 
+    @property
+    def _fP(self):
+        return _SpatialPart(self)
+
+    @_fP.setter
+    def _fP(self, value):
+        self._fX, self._fY, self._fZ = value.x, value.y, value.z
+
+    @property
+    def p3(self):
+        return _SpatialPart(self)
+
     @property
     def x(self):
-        return self._fP._fX
+        return self._fX
 
     @x.setter
     def x(self, value):
-        self._fP._fX = value
+        self._fX = value
 
     @property
     def y(self):
-        return self._fP._fY
+        return self._fY
 
     @y.setter
     def y(self, value):
-        self._fP._fY = value
+        self._fY = value
 
     @property
     def z(self):
-        return self._fP._fZ
+        return self._fZ
 
     @z.setter
     def z(self, value):
-        self._fP._fZ = value
+        self._fZ = value
 
     @property
     def t(self):
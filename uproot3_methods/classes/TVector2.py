@@ -8,10 +8,17 @@ import numbers
 import awkward0.array.jagged
 import awkward0.util
 
+import uproot3_methods.common.kernels
+import uproot3_methods.common.parallel
+import uproot3_methods.common.records
+import uproot3_methods.common.reduction
 import uproot3_methods.common.TVector
 import uproot3_methods.base
 
 class Common(object):
+    __slots__ = ()
+    _components = ("x", "y")
+
     def dot(self, other):
         out = self.x*other.x
         out = out + self.y*other.y
@@ -44,18 +51,28 @@ class ArrayMethods(Common, uproot3_methods.common.TVector.ArrayMethods, uproot3_
     def y(self):
         return self["fY"]
 
+    @uproot3_methods.common.parallel.chunkwise
     def rotate(self, angle):
-        x, y = self._rotate(angle)
-        out = self.empty_like()
+        rotated = None
+        if uproot3_methods.common.kernels.enabled:
+            rotated = uproot3_methods.common.kernels.rotate(self.x, self.y, angle)
+        if rotated is None:
+            rotated = self._rotate(angle)
+        x, y = rotated
+        out = self._to_cartesian().empty_like()
         out["fX"] = x
         out["fY"] = y
         return out
 
     def sum(self):
-        if isinstance(self, self.awkward0.JaggedArray):
-            return TVector2Array.from_cartesian(self.x.sum(), self.y.sum())
+        jagged, sums = uproot3_methods.common.reduction.componentsums(self, ("x", "y"))
+        if jagged:
+            return TVector2Array.from_cartesian(*sums)
         else:
-            return TVector2(self.x.sum(), self.y.sum())
+            return TVector2(*sums)
+
+    def _to_cartesian(self):
+        return self
 
     def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
         if "out" in kwargs:
@@ -64,19 +81,15 @@ class ArrayMethods(Common, uproot3_methods.common.TVector.ArrayMethods, uproot3_
         if method != "__call__":
             return NotImplemented
 
-        inputs = list(inputs)
-        for i in range(len(inputs)):
-            if isinstance(inputs[i], self.awkward0.numpy.ndarray) and inputs[i].dtype == self.awkward0.numpy.dtype(object) and len(inputs[i]) > 0:
-                idarray = self.awkward0.numpy.frombuffer(inputs[i], dtype=self.awkward0.numpy.uintp)
-                if (idarray == idarray[0]).all():
-                    inputs[i] = inputs[i][0]
+        inputs = [uproot3_methods.base._unbroadcast(x) for x in inputs]
 
         if ufunc is self.awkward0.numpy.add or ufunc is self.awkward0.numpy.subtract:
             if not all(isinstance(x, (ArrayMethods, Methods)) for x in inputs):
                 raise TypeError("(arrays of) TVector2 can only be added to/subtracted from other (arrays of) TVector2")
-            out = self.empty_like()
-            out["fX"] = getattr(ufunc, method)(*[x.x for x in inputs], **kwargs)
-            out["fY"] = getattr(ufunc, method)(*[x.y for x in inputs], **kwargs)
+            cart_inputs = [x._to_cartesian() for x in inputs]
+            out = [x for x in cart_inputs if isinstance(x, ArrayMethods)][0].empty_like()
+            out["fX"] = uproot3_methods.common.kernels.apply(ufunc, [x.x for x in cart_inputs], kwargs)
+            out["fY"] = uproot3_methods.common.kernels.apply(ufunc, [x.y for x in cart_inputs], kwargs)
             return out
 
         elif ufunc is self.awkward0.numpy.power and len(inputs) >= 2 and isinstance(inputs[1], (numbers.Number, self.awkward0.numpy.number)):
@@ -93,7 +106,79 @@ class ArrayMethods(Common, uproot3_methods.common.TVector.ArrayMethods, uproot3_
 
 JaggedArrayMethods = ArrayMethods.mixin(ArrayMethods, awkward0.JaggedArray)
 
+class PolarArrayMethods(ArrayMethods):
+    def _initObjectArray(self, table):
+        self.awkward0.ObjectArray.__init__(self, table, lambda row: TVector2.from_polar(row["fRho"], row["fPhi"]))
+
+    def __awkward_serialize__(self, serializer):
+        self._valid()
+        rho, phi = self.rho, self.phi
+        return serializer.encode_call(
+            ["uproot3_methods.classes.TVector2", "TVector2Array", "from_polar"],
+            serializer(rho, "TVector2Array.rho"),
+            serializer(phi, "TVector2Array.phi"))
+
+    @property
+    @uproot3_methods.common.parallel.chunkwise
+    def x(self):
+        return self._trymemo("x", lambda self: self["fRho"] * self.awkward0.numpy.cos(self["fPhi"]))
+
+    @property
+    @uproot3_methods.common.parallel.chunkwise
+    def y(self):
+        return self._trymemo("y", lambda self: self["fRho"] * self.awkward0.numpy.sin(self["fPhi"]))
+
+    @property
+    def rho(self):
+        return self["fRho"]
+
+    @property
+    def rho2(self):
+        return self["fRho"]**2
+
+    @property
+    def mag(self):
+        return self["fRho"]
+
+    @property
+    def mag2(self):
+        return self["fRho"]**2
+
+    @property
+    def phi(self):
+        return self["fPhi"]
+
+    def rotate(self, angle):
+        out = self.empty_like()
+        out["fRho"] = self["fRho"]
+        out["fPhi"] = (self["fPhi"] + angle + math.pi) % (2*math.pi) - math.pi
+        return out
+
+    def _to_cartesian(self):
+        return TVector2Array.from_cartesian(self.x, self.y)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        inputs = [uproot3_methods.base._unbroadcast(x) for x in inputs]
+        factor = None if "out" in kwargs else uproot3_methods.common.TVector._scalefactor(self, ufunc, method, inputs)
+        if factor is None:
+            return uproot3_methods.common.TVector._cartesianufunc(self, ufunc, method, inputs, kwargs)
+
+        # scaling changes only rho; a negative factor turns phi around
+        rho = self["fRho"] * factor
+        flip = (rho < 0)
+        out = self.empty_like()
+        if self.awkward0.numpy.any(flip):
+            out["fRho"] = self.awkward0.numpy.absolute(rho)
+            out["fPhi"] = uproot3_methods.common.TVector._flipphi(self.awkward0.numpy, self["fPhi"], flip)
+        else:
+            out["fRho"] = rho
+            out["fPhi"] = self["fPhi"]
+        return out
+
+PolarJaggedArrayMethods = PolarArrayMethods.mixin(PolarArrayMethods, awkward0.JaggedArray)
+
 class Methods(Common, uproot3_methods.common.TVector.Methods, uproot3_methods.base.ROOTMethods):
+    __slots__ = ()
     _arraymethods = ArrayMethods
 
     @property
@@ -104,6 +189,9 @@ class Methods(Common, uproot3_methods.common.TVector.Methods, uproot3_methods.ba
     def y(self):
         return self._fY
 
+    def _to_cartesian(self):
+        return self
+
     def __repr__(self):
         return "TVector2({0:.5g}, {1:.5g})".format(self.x, self.y)
 
@@ -122,6 +210,8 @@ class Methods(Common, uproot3_methods.common.TVector.Methods, uproot3_methods.ba
             return TVector2(operator(self.x, scalar), operator(self.y, scalar))
 
     def _vector(self, operator, vector, reverse=False):
+        if isinstance(vector, (self.awkward0.AwkwardArray, self.awkward0.numpy.ndarray)):
+            return NotImplemented
         if not isinstance(vector, Methods):
             raise TypeError("cannot {0} a TVector2 with a {1}".format(operator.__name__, type(vector).__name__))
         if reverse:
@@ -136,6 +226,14 @@ class Methods(Common, uproot3_methods.common.TVector.Methods, uproot3_methods.ba
         x, y = self._rotate(angle)
         return TVector2(x, y)
 
+class PolarTVector2Array(PolarArrayMethods, uproot3_methods.base.ROOTMethods.awkward0.ObjectArray):
+    def __init__(self, rho, phi):
+        if isinstance(rho, awkward0.array.jagged.JaggedArray) or isinstance(phi, awkward0.array.jagged.JaggedArray):
+            raise TypeError("PolarTVector2Array constructor arguments must not be jagged; use TVector2Array.from_polar for jaggedness-handling")
+        self._initObjectArray(self.awkward0.Table())
+        self["fRho"] = rho
+        self["fPhi"] = phi
+
 class TVector2Array(ArrayMethods, uproot3_methods.base.ROOTMethods.awkward0.ObjectArray):
 
     def __init__(self, x, y):
@@ -161,10 +259,47 @@ class TVector2Array(ArrayMethods, uproot3_methods.base.ROOTMethods.awkward0.Obje
         return cls(x, y)
 
     @classmethod
-    @awkward0.util.wrapjaggedmethod(JaggedArrayMethods)
+    @awkward0.util.wrapjaggedmethod(PolarJaggedArrayMethods)
     def from_polar(cls, rho, phi):
-        return cls(rho * cls.awkward0.numpy.cos(phi),
-                   rho * cls.awkward0.numpy.sin(phi))
+        return PolarTVector2Array(rho, phi)
+
+    @classmethod
+    def from_objects(cls, objects):
+        counts, objects = uproot3_methods.common.records.flatten(objects)
+        return cls.from_cartesian(*uproot3_methods.common.records.components(objects, ("x", "y"), counts))
+
+    @classmethod
+    def from_records(cls, records, dtype=None, names=None):
+        names, columns = uproot3_methods.common.records.fields(records, (("fX", "fY"), ("x", "y")), dtype, names)
+        return cls.from_cartesian(*columns)
+
+    @classmethod
+    def propagate_met(cls, met, nominal, variations):
+        """Returns N varied MET arrays as an (N, events) jagged array: met minus the per-event sum of (varied - nominal) jet momenta."""
+        numpy = cls.awkward0.numpy
+        counts = nominal.counts
+        for variation in variations:
+            if not numpy.array_equal(variation.counts, counts):
+                raise ValueError("every variation must have the same number of jets per event as the nominal collection")
+
+        # jets are taken event by event through each array's own starts and stops (which may be sliced,
+        # masked, or not compact), so offsets start at zero and jet j of every array lines up
+        numvariations, numevents, offsets = len(variations), len(nominal), nominal.counts2offsets(counts)
+        delta = numpy.empty((2, numvariations, offsets[-1]), dtype=numpy.float64)
+        for i, xy in enumerate(("x", "y")):
+            nominalxy = numpy.asarray(getattr(nominal, xy).flatten())
+            for j, variation in enumerate(variations):
+                numpy.subtract(getattr(variation, xy).flatten(), nominalxy, out=delta[i, j])
+
+        # one reduceat over all variations and both components; events without jets are left unchanged
+        out = numpy.empty((2, numvariations, numevents), dtype=numpy.float64)
+        out[0] = met.x
+        out[1] = met.y
+        nonempty = (counts > 0)
+        if numvariations > 0 and nonempty.any():
+            out[:, :, nonempty] -= numpy.add.reduceat(delta, offsets[:-1][nonempty], axis=2)
+
+        return JaggedArrayMethods.fromoffsets(numpy.arange(0, (numvariations + 1)*numevents, numevents), cls(out[0].reshape(-1), out[1].reshape(-1)))
 
     @property
     def x(self):
@@ -183,6 +318,8 @@ class TVector2Array(ArrayMethods, uproot3_methods.base.ROOTMethods.awkward0.Obje
         self["fY"] = value
 
 class TVector2(Methods):
+    __slots__ = ("_fX", "_fY")
+
     def __init__(self, x, y):
         self._fX = float(x)
         self._fY = float(y)
@@ -9,9 +9,17 @@ import awkward0.array.jagged
 import awkward0.util
 
 import uproot3_methods.base
+import uproot3_methods.common.approx
+import uproot3_methods.common.kernels
+import uproot3_methods.common.parallel
+import uproot3_methods.common.records
+import uproot3_methods.common.reduction
 import uproot3_methods.common.TVector
 
 class Common(object):
+    __slots__ = ()
+    _components = ("x", "y", "z")
+
     def dot(self, other):
         out = self.x*other.x
         out = out + self.y*other.y
@@ -104,39 +112,54 @@ class ArrayMethods(Common, uproot3_methods.common.TVector.ArrayMethods, uproot3_
     def z(self):
         return self["fZ"]
 
+    @uproot3_methods.common.parallel.chunkwise
     def cross(self, other):
         x, y, z = self._cross(other)
-        out = self.empty_like()
+        out = self._to_cartesian().empty_like()
         out["fX"] = x
         out["fY"] = y
         out["fZ"] = z
         return out
 
     @property
+    @uproot3_methods.common.parallel.chunkwise
     def theta(self):
+        if uproot3_methods.common.approx.enabled:
+            return self._trymemo("approx_theta", lambda self: uproot3_methods.common.approx.theta(self.x, self.y, self.z))
         return self.awkward0.numpy.arctan2(self.rho, self.z)
 
+    @uproot3_methods.common.parallel.chunkwise
     def rotate_axis(self, axis, angle):
-        x, y, z = self._rotate_axis(axis, angle)
-        out = self.empty_like()
+        rotated = None
+        if uproot3_methods.common.kernels.enabled:
+            rotated = uproot3_methods.common.kernels.rotate_axis(self.x, self.y, self.z, axis.x, axis.y, axis.z, angle)
+        if rotated is None:
+            rotated = self._rotate_axis(axis, angle)
+        x, y, z = rotated
+        out = self._to_cartesian().empty_like()
         out["fX"] = x
         out["fY"] = y
         out["fZ"] = z
         return out
 
+    @uproot3_methods.common.parallel.chunkwise
     def rotate_euler(self, phi=0, theta=0, psi=0):
         x, y, z = self._rotate_euler(phi, theta, psi)
-        out = self.empty_like()
+        out = self._to_cartesian().empty_like()
         out["fX"] = x
         out["fY"] = y
         out["fZ"] = z
         return out
 
     def sum(self):
-        if isinstance(self, self.awkward0.JaggedArray):
-            return TVector3Array.from_cartesian(self.x.sum(), self.y.sum(), self.z.sum())
+        jagged, sums = uproot3_methods.common.reduction.componentsums(self, ("x", "y", "z"))
+        if jagged:
+            return TVector3Array.from_cartesian(*sums)
         else:
-            return TVector3(self.x.sum(), self.y.sum(), self.z.sum())
+            return TVector3(*sums)
+
+    def _to_cartesian(self):
+        return self
 
     def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
         if "out" in kwargs:
@@ -145,20 +168,16 @@ class ArrayMethods(Common, uproot3_methods.common.TVector.ArrayMethods, uproot3_
         if method != "__call__":
             return NotImplemented
 
-        inputs = list(inputs)
-        for i in range(len(inputs)):
-            if isinstance(inputs[i], self.awkward0.numpy.ndarray) and inputs[i].dtype == self.awkward0.numpy.dtype(object) and len(inputs[i]) > 0:
-                idarray = self.awkward0.numpy.frombuffer(inputs[i], dtype=self.awkward0.numpy.uintp)
-                if (idarray == idarray[0]).all():
-                    inputs[i] = inputs[i][0]
+        inputs = [uproot3_methods.base._unbroadcast(x) for x in inputs]
 
         if ufunc is self.awkward0.numpy.add or ufunc is self.awkward0.numpy.subtract:
             if not all(isinstance(x, (ArrayMethods, Methods)) for x in inputs):
                 raise TypeError("(arrays of) TVector3 can only be added to/subtracted from other (arrays of) TVector3")
-            out = self.empty_like()
-            out["fX"] = getattr(ufunc, method)(*[x.x for x in inputs], **kwargs)
-            out["fY"] = getattr(ufunc, method)(*[x.y for x in inputs], **kwargs)
-            out["fZ"] = getattr(ufunc, method)(*[x.z for x in inputs], **kwargs)
+            cart_inputs = [x._to_cartesian() for x in inputs]
+            out = [x for x in cart_inputs if isinstance(x, ArrayMethods)][0].empty_like()
+            out["fX"] = uproot3_methods.common.kernels.apply(ufunc, [x.x for x in cart_inputs], kwargs)
+            out["fY"] = uproot3_methods.common.kernels.apply(ufunc, [x.y for x in cart_inputs], kwargs)
+            out["fZ"] = uproot3_methods.common.kernels.apply(ufunc, [x.z for x in cart_inputs], kwargs)
             return out
 
         elif ufunc is self.awkward0.numpy.power and len(inputs) >= 2 and isinstance(inputs[1], (numbers.Number, self.awkward0.numpy.number)):
@@ -175,7 +194,172 @@ class ArrayMethods(Common, uproot3_methods.common.TVector.ArrayMethods, uproot3_
 
 JaggedArrayMethods = ArrayMethods.mixin(ArrayMethods, awkward0.JaggedArray)
 
+class SphericalArrayMethods(ArrayMethods):
+    def _initObjectArray(self, table):
+        self.awkward0.ObjectArray.__init__(self, table, lambda row: TVector3.from_spherical(row["fR"], row["fTheta"], row["fPhi"]))
+
+    def __awkward_serialize__(self, serializer):
+        self._valid()
+        r, theta, phi = self.mag, self.theta, self.phi
+        return serializer.encode_call(
+            ["uproot3_methods.classes.TVector3", "TVector3Array", "from_spherical"],
+            serializer(r, "TVector3Array.r"),
+            serializer(theta, "TVector3Array.theta"),
+            serializer(phi, "TVector3Array.phi"))
+
+    @property
+    @uproot3_methods.common.parallel.chunkwise
+    def x(self):
+        return self._trymemo("x", lambda self: self.rho * self.awkward0.numpy.cos(self["fPhi"]))
+
+    @property
+    @uproot3_methods.common.parallel.chunkwise
+    def y(self):
+        return self._trymemo("y", lambda self: self.rho * self.awkward0.numpy.sin(self["fPhi"]))
+
+    @property
+    @uproot3_methods.common.parallel.chunkwise
+    def z(self):
+        return self._trymemo("z", lambda self: self["fR"] * self.awkward0.numpy.cos(self["fTheta"]))
+
+    @property
+    @uproot3_methods.common.parallel.chunkwise
+    def rho(self):
+        return self._trymemo("rho", lambda self: self["fR"] * self.awkward0.numpy.sin(self["fTheta"]))
+
+    @property
+    def rho2(self):
+        return self.rho**2
+
+    @property
+    def mag(self):
+        return self["fR"]
+
+    @property
+    def mag2(self):
+        return self["fR"]**2
+
+    @property
+    def theta(self):
+        return self["fTheta"]
+
+    @property
+    def phi(self):
+        return self["fPhi"]
+
+    def rotatez(self, angle):
+        out = self.empty_like()
+        out["fR"] = self["fR"]
+        out["fTheta"] = self["fTheta"]
+        out["fPhi"] = (self["fPhi"] + angle + math.pi) % (2*math.pi) - math.pi
+        return out
+
+    def _to_cartesian(self):
+        return TVector3Array.from_cartesian(self.x, self.y, self.z)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        inputs = [uproot3_methods.base._unbroadcast(x) for x in inputs]
+        factor = None if "out" in kwargs else uproot3_methods.common.TVector._scalefactor(self, ufunc, method, inputs)
+        if factor is None:
+            return uproot3_methods.common.TVector._cartesianufunc(self, ufunc, method, inputs, kwargs)
+
+        # scaling changes only r; a negative factor points the other way
+        r = self["fR"] * factor
+        flip = (r < 0)
+        out = self.empty_like()
+        if self.awkward0.numpy.any(flip):
+            out["fR"] = self.awkward0.numpy.absolute(r)
+            out["fTheta"] = self.awkward0.numpy.where(flip, math.pi - self["fTheta"], self["fTheta"])
+            out["fPhi"] = uproot3_methods.common.TVector._flipphi(self.awkward0.numpy, self["fPhi"], flip)
+        else:
+            out["fR"] = r
+            out["fTheta"] = self["fTheta"]
+            out["fPhi"] = self["fPhi"]
+        return out
+
+SphericalJaggedArrayMethods = SphericalArrayMethods.mixin(SphericalArrayMethods, awkward0.JaggedArray)
+
+class CylindricalArrayMethods(ArrayMethods):
+    def _initObjectArray(self, table):
+        self.awkward0.ObjectArray.__init__(self, table, lambda row: TVector3.from_cylindrical(row["fRho"], row["fPhi"], row["fZ"]))
+
+    def __awkward_serialize__(self, serializer):
+        self._valid()
+        rho, phi, z = self.rho, self.phi, self.z
+        return serializer.encode_call(
+            ["uproot3_methods.classes.TVector3", "TVector3Array", "from_cylindrical"],
+            serializer(rho, "TVector3Array.rho"),
+            serializer(phi, "TVector3Array.phi"),
+            serializer(z, "TVector3Array.z"))
+
+    @property
+    @uproot3_methods.common.parallel.chunkwise
+    def x(self):
+        return self._trymemo("x", lambda self: self["fRho"] * self.awkward0.numpy.cos(self["fPhi"]))
+
+    @property
+    @uproot3_methods.common.parallel.chunkwise
+    def y(self):
+        return self._trymemo("y", lambda self: self["fRho"] * self.awkward0.numpy.sin(self["fPhi"]))
+
+    @property
+    def z(self):
+        return self["fZ"]
+
+    @property
+    def rho(self):
+        return self["fRho"]
+
+    @property
+    def rho2(self):
+        return self["fRho"]**2
+
+    @property
+    def mag2(self):
+        return self["fRho"]**2 + self["fZ"]**2
+
+    @property
+    @uproot3_methods.common.parallel.chunkwise
+    def theta(self):
+        return self._trymemo("theta", lambda self: self.awkward0.numpy.arctan2(self["fRho"], self["fZ"]))
+
+    @property
+    def phi(self):
+        return self["fPhi"]
+
+    def rotatez(self, angle):
+        out = self.empty_like()
+        out["fRho"] = self["fRho"]
+        out["fPhi"] = (self["fPhi"] + angle + math.pi) % (2*math.pi) - math.pi
+        out["fZ"] = self["fZ"]
+        return out
+
+    def _to_cartesian(self):
+        return TVector3Array.from_cartesian(self.x, self.y, self.z)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        inputs = [uproot3_methods.base._unbroadcast(x) for x in inputs]
+        factor = None if "out" in kwargs else uproot3_methods.common.TVector._scalefactor(self, ufunc, method, inputs)
+        if factor is None:
+            return uproot3_methods.common.TVector._cartesianufunc(self, ufunc, method, inputs, kwargs)
+
+        # scaling changes rho and z; a negative factor turns phi around
+        rho = self["fRho"] * factor
+        flip = (rho < 0)
+        out = self.empty_like()
+        if self.awkward0.numpy.any(flip):
+            out["fRho"] = self.awkward0.numpy.absolute(rho)
+            out["fPhi"] = uproot3_methods.common.TVector._flipphi(self.awkward0.numpy, self["fPhi"], flip)
+        else:
+            out["fRho"] = rho
+            out["fPhi"] = self["fPhi"]
+        out["fZ"] = self["fZ"] * factor
+        return out
+
+CylindricalJaggedArrayMethods = CylindricalArrayMethods.mixin(CylindricalArrayMethods, awkward0.JaggedArray)
+
 class Methods(Common, uproot3_methods.common.TVector.Methods, uproot3_methods.base.ROOTMethods):
+    __slots__ = ()
     _arraymethods = ArrayMethods
 
     @property
@@ -190,6 +374,9 @@ class Methods(Common, uproot3_methods.common.TVector.Methods, uproot3_methods.ba
     def z(self):
         return self._fZ
 
+    def _to_cartesian(self):
+        return self
+
     def __repr__(self):
         return "TVector3({0:.5g}, {1:.5g}, {2:.5g})".format(self.x, self.y, self.z)
 
@@ -208,6 +395,8 @@ class Methods(Common, uproot3_methods.common.TVector.Methods, uproot3_methods.ba
             return TVector3(operator(self.x, scalar), operator(self.y, scalar), operator(self.z, scalar))
 
     def _vector(self, operator, vector, reverse=False):
+        if isinstance(vector, (self.awkward0.AwkwardArray, self.awkward0.numpy.ndarray)):
+            return NotImplemented
         if not isinstance(vector, Methods):
             raise TypeError("cannot {0} a TVector3 with a {1}".format(operator.__name__, type(vector).__name__))
         if reverse:
@@ -245,6 +434,24 @@ class Methods(Common, uproot3_methods.common.TVector.Methods, uproot3_methods.ba
     def rotate_euler(self, phi=0, theta=0, psi=0):
         return TVector3(x, y, z)
 
+class SphericalTVector3Array(SphericalArrayMethods, uproot3_methods.base.ROOTMethods.awkward0.ObjectArray):
+    def __init__(self, r, theta, phi):
+        if isinstance(r, awkward0.array.jagged.JaggedArray) or isinstance(theta, awkward0.array.jagged.JaggedArray) or isinstance(phi, awkward0.array.jagged.JaggedArray):
+            raise TypeError("SphericalTVector3Array constructor arguments must not be jagged; use TVector3Array.from_spherical for jaggedness-handling")
+        self._initObjectArray(self.awkward0.Table())
+        self["fR"] = r
+        self["fTheta"] = theta
+        self["fPhi"] = phi
+
+class CylindricalTVector3Array(CylindricalArrayMethods, uproot3_methods.base.ROOTMethods.awkward0.ObjectArray):
+    def __init__(self, rho, phi, z):
+        if isinstance(rho, awkward0.array.jagged.JaggedArray) or isinstance(phi, awkward0.array.jagged.JaggedArray) or isinstance(z, awkward0.array.jagged.JaggedArray):
+            raise TypeError("CylindricalTVector3Array constructor arguments must not be jagged; use TVector3Array.from_cylindrical for jaggedness-handling")
+        self._initObjectArray(self.awkward0.Table())
+        self["fRho"] = rho
+        self["fPhi"] = phi
+        self["fZ"] = z
+
 class TVector3Array(ArrayMethods, uproot3_methods.base.ROOTMethods.awkward0.ObjectArray):
 
     def __init__(self, x, y, z):
@@ -273,16 +480,24 @@ class TVector3Array(ArrayMethods, uproot3_methods.base.ROOTMethods.awkward0.Obje
         return cls(x, y, z)
 
     @classmethod
-    @awkward0.util.wrapjaggedmethod(JaggedArrayMethods)
+    @awkward0.util.wrapjaggedmethod(SphericalJaggedArrayMethods)
     def from_spherical(cls, r, theta, phi):
-        return cls(r * cls.awkward0.numpy.sin(theta) * cls.awkward0.numpy.cos(phi),
-                   r * cls.awkward0.numpy.sin(theta) * cls.awkward0.numpy.sin(phi),
-                   r * cls.awkward0.numpy.cos(theta))
+        return SphericalTVector3Array(r, theta, phi)
 
     @classmethod
-    @awkward0.util.wrapjaggedmethod(JaggedArrayMethods)
+    @awkward0.util.wrapjaggedmethod(CylindricalJaggedArrayMethods)
     def from_cylindrical(cls, rho, phi, z):
-        return cls(rho * cls.awkward0.numpy.cos(phi), rho * cls.awkward0.numpy.sin(phi),z)
+        return CylindricalTVector3Array(rho, phi, z)
+
+    @classmethod
+    def from_objects(cls, objects):
+        counts, objects = uproot3_methods.common.records.flatten(objects)
+        return cls.from_cartesian(*uproot3_methods.common.records.components(objects, ("x", "y", "z"), counts))
+
+    @classmethod
+    def from_records(cls, records, dtype=None, names=None):
+        names, columns = uproot3_methods.common.records.fields(records, (("fX", "fY", "fZ"), ("x", "y", "z")), dtype, names)
+        return cls.from_cartesian(*columns)
 
     @property
     def x(self):
@@ -309,6 +524,8 @@ class TVector3Array(ArrayMethods, uproot3_methods.base.ROOTMethods.awkward0.Obje
         self["fZ"] = value
 
 class TVector3(Methods):
+    __slots__ = ("_fX", "_fY", "_fZ")
+
     def __init__(self, x, y, z):
         self._fX = float(x)
         self._fY = float(y)
@@ -0,0 +1,953 @@
+#!/usr/bin/env python
+
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot3-methods/blob/master/LICENSE
+
+import collections
+import itertools
+import math
+import numbers
+import weakref
+
+import numpy
+
+import awkward0
+
+import uproot3_methods.common.parallel
+import uproot3_methods.common.reduction
+
+# number of blocks filled concurrently into partial histograms before they are merged (a fixed
+# number, so that the order of floating-point additions does not depend on the executor)
+fillwave = 16
+
+# number of histograms of the same name summed together in one task of merge
+mergebatch = 64
+
+def _readonly(array):
+    out = array.view()
+    out.flags.writeable = False
+    return out
+
+class Binning(object):
+    # edges of one axis with and without the flow bins, all read-only and shared by every axis with the same binning
+    __slots__ = ("fingerprint", "edges", "alledges", "bins", "allbins", "__weakref__")
+
+    def __init__(self, fingerprint, edges):
+        self.fingerprint = fingerprint
+        alledges = numpy.empty(len(edges) + 2)
+        alledges[0] = -numpy.inf
+        alledges[-1] = numpy.inf
+        alledges[1:-1] = edges
+        self.edges = _readonly(alledges[1:-1])
+        self.alledges = _readonly(alledges)
+        self.bins = _readonly(numpy.lib.stride_tricks.as_strided(self.edges, (len(edges) - 1, 2), self.edges.strides*2))
+        self.allbins = _readonly(numpy.lib.stride_tricks.as_strided(self.alledges, (len(alledges) - 1, 2), self.alledges.strides*2))
+
+_binnings = weakref.WeakValueDictionary()
+
+def fingerprint(axis):
+    # variable edges that happen to be uniform get the same key as the regular axis they are equal to
+    fXbins = getattr(axis, "_fXbins", [])
+    if len(fXbins) > 0:
+        edges = numpy.asarray(fXbins, dtype=numpy.float64)
+        if not numpy.array_equal(edges, numpy.linspace(edges[0], edges[-1], len(edges))):
+            return (len(edges) - 1, edges.tobytes())
+        return (len(edges) - 1, float(edges[0]), float(edges[-1]))
+    else:
+        return (int(axis._fNbins), float(axis._fXmin), float(axis._fXmax))
+
+def binning(axis):
+    """Returns the (memoized, shared) Binning of a TAxis."""
+    out = getattr(axis, "_memo_binning", None)
+    if out is None:
+        key = fingerprint(axis)
+        out = _binnings.get(key)
+        if out is None:
+            if len(key) == 2:
+                edges = numpy.frombuffer(key[1], dtype=numpy.float64)
+            else:
+                edges = numpy.linspace(key[1], key[2], key[0] + 1)
+            out = _binnings.setdefault(key, Binning(key, edges))
+        try:
+            axis._memo_binning = out
+        except AttributeError:
+            pass
+    return out
+
+def findbins(axis, values):
+    """Returns the bin index of each value: 0 for underflow, fNbins + 1 for overflow and NaN, like ROOT's TAxis::FindBin."""
+    if len(getattr(axis, "_fXbins", [])) > 0:
+        return numpy.searchsorted(binning(axis).edges, values, side="right")
+    nbins = axis._fNbins
+    # same order of operations as ROOT, nbins*(x - xmin)/(xmax - xmin), so that values on bin edges agree
+    scaled = numpy.subtract(values, axis._fXmin, dtype=numpy.float64)
+    scaled *= nbins
+    scaled /= float(axis._fXmax - axis._fXmin)
+    numpy.clip(scaled, -1, nbins, out=scaled)
+    scaled[numpy.isnan(scaled)] = nbins
+    out = numpy.floor(scaled, out=scaled).astype(numpy.int64)
+    out += 1
+    return out
+
+def _fillblocks(coordinates, weight, weightshape=()):
+    # yields ([float64 coordinates], weights or None) in blocks of at most reduction.blocksize entries:
+    # ChunkedArrays are taken one chunk at a time, JaggedArrays through their flat content, and
+    # per-event weights of jagged coordinates are expanded through the offsets one block at a time
+    coordinates = [x.array if isinstance(x, awkward0.VirtualArray) else x for x in coordinates]
+    if isinstance(weight, awkward0.VirtualArray):
+        weight = weight.array
+
+    chunked = [x for x in coordinates + [weight] if isinstance(x, awkward0.ChunkedArray)]
+    if len(chunked) > 0:
+        start = 0
+        for i, chunk in enumerate(chunked[0].chunks):
+            stop = start + len(chunk)
+            def piece(x):
+                if isinstance(x, awkward0.ChunkedArray):
+                    if len(x.chunks) != len(chunked[0].chunks):
+                        raise ValueError("chunked coordinates and weights must have the same chunks")
+                    return x.chunks[i]
+                elif x is None or numpy.ndim(x) == 0:
+                    return x
+                else:
+                    return x[start:stop]
+            for out in _fillblocks([piece(x) for x in coordinates], piece(weight), weightshape):
+                yield out
+            start = stop
+        return
+
+    offsets = None
+    jagged = [x for x in coordinates if isinstance(x, awkward0.JaggedArray)]
+    if len(jagged) > 0:
+        counts = jagged[0].counts
+        if len(jagged) != len(coordinates) or any(not numpy.array_equal(x.counts, counts) for x in jagged[1:]):
+            raise ValueError("jagged coordinates must all be jagged, with the same number of entries per event")
+        offsets = jagged[0].counts2offsets(counts)
+        coordinates = [x.flatten() for x in coordinates]
+        if isinstance(weight, awkward0.JaggedArray):
+            if not numpy.array_equal(weight.counts, counts):
+                raise ValueError("jagged weights must have the same number of entries per event as the coordinates")
+            weight = weight.flatten()
+            offsets = None
+        elif weight is not None and numpy.ndim(weight) != 0:
+            if len(weight) != len(counts):
+                raise ValueError("weights of jagged coordinates must be jagged, per event, or a number")
+        else:
+            offsets = None
+
+    coordinates = [numpy.asarray(x).reshape(-1) for x in coordinates]
+    length = len(coordinates[0])
+    if any(len(x) != length for x in coordinates):
+        raise ValueError("all coordinates must have the same length")
+    if weight is not None:
+        weight = numpy.asarray(weight)
+        if weight.ndim != 0:
+            weight = weight.reshape((-1,) + weightshape)
+            if offsets is None and len(weight) != length:
+                raise ValueError("weight must be a number or have the same length as the values")
+
+    for start, stop in uproot3_methods.common.reduction._blocks(length):
+        block = [numpy.asarray(x[start:stop], dtype=numpy.float64) for x in coordinates]
+        if weight is None:
+            w = None
+        elif weight.ndim == 0:
+            w = numpy.full((stop - start,) + weightshape, weight)
+        elif offsets is None:
+            w = weight[start:stop]
+        else:
+            first = numpy.searchsorted(offsets, start, side="right") - 1
+            last = numpy.searchsorted(offsets, stop, side="left")
+            w = numpy.repeat(weight[first:last], numpy.diff(numpy.clip(offsets[first:last + 1], start, stop)), axis=0)
+        yield block, w
+
+def _splitmix64(z):
+    z = z + numpy.uint64(0x9e3779b97f4a7c15)
+    z = (z ^ (z >> numpy.uint64(30))) * numpy.uint64(0xbf58476d1ce4e5b9)
+    z = (z ^ (z >> numpy.uint64(27))) * numpy.uint64(0x94d049bb133111eb)
+    return z ^ (z >> numpy.uint64(31))
+
+# cumulative distribution of Poisson(1), up to where it reaches 1 in double precision
+_poisson1cdf = numpy.cumsum([math.exp(-1) / math.factorial(k) for k in range(20)])
+
+def poisson1(seed, eventnumbers, replicas):
+    """Returns (len(eventnumbers), replicas) Poisson(1) bootstrap weights, a pure function of (seed, event number, replica)."""
+    with numpy.errstate(over="ignore"):
+        key = _splitmix64(numpy.asarray(eventnumbers).astype(numpy.uint64) ^ _splitmix64(numpy.uint64(seed)))
+        counters = key[:, numpy.newaxis] + numpy.arange(replicas, dtype=numpy.uint64) * numpy.uint64(0x9e3779b97f4a7c15)
+        uniform = (_splitmix64(counters) >> numpy.uint64(11)) * (1.0 / 9007199254740992.0)
+    return numpy.searchsorted(_poisson1cdf, uniform, side="right").astype(numpy.float64)
+
+def _fillpartial(empty, block, w):
+    out = empty._emptypartial()
+    out.__dict__.update(out._fillblock(block, w))
+    return out
+
+def _addstats(histogram, stats):
+    for n, x in stats.items():
+        setattr(histogram, n, getattr(histogram, n, 0) + x)
+
+def _sumstats(one, two):
+    return dict((n, one.get(n, 0) + x) for n, x in two.items())
+
+def _addpartials(histogram, partial):
+    histogram._fArray += partial._fArray
+    if len(histogram._fSumw2) == len(histogram._fArray):
+        histogram._fSumw2 += partial._fSumw2
+    _addstats(histogram, dict((n, x) for n, x in partial.__dict__.items() if n == "_fEntries" or n.startswith("_fTsumw")))
+    return histogram
+
+_ufuncoperators = {numpy.add: ("__add__", "__radd__"),
+                   numpy.subtract: ("__sub__", None),
+                   numpy.multiply: ("__mul__", "__rmul__"),
+                   numpy.true_divide: ("__truediv__", None)}
+
+def _isnumber(x):
+    return isinstance(x, (numbers.Number, numpy.number))
+
+class Arithmetic(object):
+    # +, -, * and / between histograms of the same binning, and scaling by numbers, with _fSumw2 and
+    # the statistics propagated like ROOT's TH1::Add, Multiply, Divide and Scale; results are array-backed
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        # binary +, -, * and / go to the histogram operators (so that NumPy scalars reach __rmul__ and are
+        # refused by + and - just like Python numbers), and whatever they do not handle with an array, like
+        # every other ufunc, acts on the bin contents as a plain array
+        names = _ufuncoperators.get(ufunc)
+        if names is not None and method == "__call__" and len(inputs) == 2 and len(kwargs) == 0:
+            if inputs[0] is self:
+                other, out = inputs[1], getattr(self, names[0])(inputs[1])
+            elif names[1] is not None:
+                other, out = inputs[0], getattr(self, names[1])(inputs[0])
+            else:
+                other, out = inputs[0], NotImplemented
+            if out is not NotImplemented or _isnumber(other):
+                return out
+        inputs = [numpy.asarray(x) if isinstance(x, Arithmetic) else x for x in inputs]
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    def _compatible(self, other):
+        mine, theirs = self._axes, other._axes
+        if len(mine) != len(theirs) or any(binning(x) is not binning(y) for x, y in zip(mine, theirs)):
+            raise ValueError("cannot combine histograms with different binning")
+
+    def _contentsvariances(self):
+        contents = numpy.asarray(self, dtype=numpy.float64).reshape(-1)
+        sumw2 = getattr(self, "_fSumw2", [])
+        if len(sumw2) == len(contents):
+            return contents, numpy.asarray(sumw2, dtype=numpy.float64)
+        else:
+            return contents, contents
+
+    def _stats(self):
+        return dict((n, x) for n, x in self.__dict__.items() if n == "_fEntries" or n.startswith("_fTsumw"))
+
+    def _copy(self):
+        out = self._arraytype.__new__(self._arraytype)
+        for n, x in self.__dict__.items():
+            if n.startswith("_f") and n not in ("_fArray", "_fSumw2"):
+                setattr(out, n, x)
+        contents, variances = self._contentsvariances()
+        out._setarrays(numpy.array(contents), variances)
+        out._classname = self._classname[:-1] + b"D"
+        return out
+
+    def _inplace(self):
+        # self, made double precision and given a _fSumw2, or None if it is not array-backed
+        if not isinstance(self, ArrayBacked):
+            return None
+        if self._fArray.dtype != numpy.dtype(numpy.float64):
+            self._setarrays(self._fArray.astype(numpy.float64), self._fSumw2 if len(self._fSumw2) > 0 else None)
+            self._classname = self._classname[:-1] + b"D"
+        if len(self._fSumw2) != len(self._fArray):
+            self._fSumw2 = self._fArray.copy()
+        return self
+
+    def _add(self, other, sign):
+        self._compatible(other)
+        contents, variances = other._contentsvariances()
+        if sign > 0:
+            self._fArray += contents
+        else:
+            self._fArray -= contents
+        self._fSumw2 += variances
+        for n, x in other._stats().items():
+            if n == "_fEntries" or n == "_fTsumw2":
+                setattr(self, n, getattr(self, n, 0) + x)
+            else:
+                setattr(self, n, getattr(self, n, 0) + sign*x)
+        return self
+
+    def _scale(self, factor):
+        self._fArray *= factor
+        self._fSumw2 *= factor**2
+        for n, x in self._stats().items():
+            if n == "_fTsumw2":
+                setattr(self, n, x * factor**2)
+            elif n != "_fEntries":
+                setattr(self, n, x * factor)
+        return self
+
+    def _multiply(self, other, divide):
+        self._compatible(other)
+        a, va = self._fArray, self._fSumw2
+        b, vb = other._contentsvariances()
+        if divide:
+            # bins divided by zero are set to zero, as in ROOT
+            nonzero = (b != 0)
+            with numpy.errstate(divide="ignore", invalid="ignore"):
+                variances = numpy.where(nonzero, (va*b*b + vb*a*a) / b**4, 0)
+                a[...] = numpy.where(nonzero, a / b, 0)
+        else:
+            variances = va*b*b + vb*a*a
+            a *= b
+        va[...] = variances
+        self._resetstats()
+        return self
+
+    def _resetstats(self):
+        # statistics recomputed from the in-range contents at the bin centers, as ROOT's ResetStats
+        inner = (slice(1, -1),)*len(self._axes)
+        values = numpy.asarray(self.allvalues[inner], dtype=numpy.float64)
+        centers = [(x.edges[1:] + x.edges[:-1]) / 2.0 for x in [binning(axis) for axis in self._axes]]
+        self._fTsumw = values.sum()
+        self._fTsumw2 = numpy.asarray(self.allvariances[inner]).sum()
+        names = "xyz"[:len(centers)]
+        for i, n in enumerate(names):
+            marginal = values.sum(axis=tuple(k for k in range(len(names)) if k != i))
+            setattr(self, "_fTsumw" + n, centers[i].dot(marginal))
+            setattr(self, "_fTsumw" + n + "2", (centers[i]**2).dot(marginal))
+            for j in range(i + 1, len(names)):
+                marginal = values.sum(axis=tuple(k for k in range(len(names)) if k != i and k != j))
+                setattr(self, "_fTsumw" + n + names[j], centers[i].dot(marginal).dot(centers[j]))
+        self._fEntries = self._fTsumw**2 / self._fTsumw2 if self._fTsumw2 > 0 else 0.0
+
+    def __add__(self, other):
+        if _isnumber(other) and other == 0:
+            return self._copy()
+        if not isinstance(other, Arithmetic):
+            return NotImplemented
+        return self._copy()._add(other, 1)
+
+    def __radd__(self, other):
+        # so that sum(histograms) works
+        if _isnumber(other) and other == 0:
+            return self._copy()
+        return NotImplemented
+
+    def __iadd__(self, other):
+        if self._inplace() is None:
+            return self.__add__(other)
+        if _isnumber(other) and other == 0:
+            return self
+        if not isinstance(other, Arithmetic):
+            return NotImplemented
+        return self._add(other, 1)
+
+    def __sub__(self, other):
+        if not isinstance(other, Arithmetic):
+            return NotImplemented
+        return self._copy()._add(other, -1)
+
+    def __isub__(self, other):
+        if self._inplace() is None:
+            return self.__sub__(other)
+        if not isinstance(other, Arithmetic):
+            return NotImplemented
+        return self._add(other, -1)
+
+    def __mul__(self, other):
+        if _isnumber(other):
+            return self._copy()._scale(other)
+        if not isinstance(other, Arithmetic):
+            return NotImplemented
+        return self._copy()._multiply(other, False)
+
+    def __rmul__(self, other):
+        if _isnumber(other):
+            return self._copy()._scale(other)
+        return NotImplemented
+
+    def __imul__(self, other):
+        if self._inplace() is None:
+            return self.__mul__(other)
+        if _isnumber(other):
+            return self._scale(other)
+        if not isinstance(other, Arithmetic):
+            return NotImplemented
+        return self._multiply(other, False)
+
+    def __truediv__(self, other):
+        if _isnumber(other):
+            return self._copy()._scale(1.0 / other)
+        if not isinstance(other, Arithmetic):
+            return NotImplemented
+        return self._copy()._multiply(other, True)
+
+    def __itruediv__(self, other):
+        if self._inplace() is None:
+            return self.__truediv__(other)
+        if _isnumber(other):
+            return self._scale(1.0 / other)
+        if not isinstance(other, Arithmetic):
+            return NotImplemented
+        return self._multiply(other, True)
+
+    __div__ = __truediv__
+    __idiv__ = __itruediv__
+
+def _sumall(histograms):
+    return uproot3_methods.common.reduction.treereduce([x._copy() for x in histograms], lambda a, b: a._add(b, 1))
+
+def merge(histograms, executor=None):
+    """Sums histograms of the same name and binning (given as histograms or (name, histogram) pairs, from any iterable) into {name: {fingerprints: histogram}}, with one entry per binning (a tuple of fingerprint(axis) for each axis) seen under that name."""
+    if executor is None:
+        executor = uproot3_methods.common.parallel.executor
+
+    # batches of each (name, axis fingerprints) group are summed as pairwise trees (on the executor, if any), then added in order
+    batches, totals, pending = {}, {}, collections.deque()
+    def resolve(group, partial):
+        if group in totals:
+            totals[group]._add(partial, 1)
+        else:
+            totals[group] = partial
+    def submit(group, batch):
+        if executor is None:
+            resolve(group, _sumall(batch))
+        else:
+            pending.append((group, executor.submit(_sumall, batch)))
+            while len(pending) > mergebatch:
+                group, future = pending.popleft()
+                resolve(group, future.result())
+
+    for item in histograms:
+        if isinstance(item, tuple):
+            name, histogram = item
+        else:
+            name, histogram = getattr(item, "_fName", None), item
+        group = (name, tuple(binning(x).fingerprint for x in histogram._axes))
+        batch = batches.setdefault(group, [])
+        batch.append(histogram)
+        if len(batch) >= mergebatch:
+            submit(group, batches.pop(group))
+
+    for group, batch in list(batches.items()):
+        submit(group, batch)
+    while len(pending) > 0:
+        group, future = pending.popleft()
+        resolve(group, future.result())
+
+    out = {}
+    for (name, key), histogram in totals.items():
+        out.setdefault(name, {})[key] = histogram
+    return out
+
+def _histogramtype(dimension):
+    import uproot3_methods.classes.TH1
+    import uproot3_methods.classes.TH2
+    import uproot3_methods.classes.TH3
+    return {1: uproot3_methods.classes.TH1.TH1, 2: uproot3_methods.classes.TH2.TH2, 3: uproot3_methods.classes.TH3.TH3}[dimension]
+
+def _starts(edges, newedges):
+    # first all-bins index (0 is underflow) of each new bin; old bins outside the new edges join the flow bins
+    newedges = numpy.asarray(newedges, dtype=numpy.float64)
+    positions = numpy.searchsorted(edges, newedges)
+    if len(newedges) < 2 or (positions >= len(edges)).any() or not numpy.allclose(edges[numpy.minimum(positions, len(edges) - 1)], newedges, rtol=1e-12, atol=0) or (numpy.diff(positions) <= 0).any():
+        raise ValueError("new edges must be an increasing subset of at least two of the old edges")
+    return newedges, numpy.concatenate([[0], positions + 1])
+
+_typecodes = {"i1": b"C", "i2": b"S", "i4": b"I", "f4": b"F"}
+
+class Rebinning(object):
+    # rebin, slice and project by summing groups of bins with numpy.add.reduceat over the contents
+    # including the flow bins, so that entries outside the new ranges land in the under/overflows
+
+    def _axisindex(self, axis):
+        if isinstance(axis, str):
+            axis = "xyz".index(axis)
+        if not 0 <= axis < len(self._axes):
+            raise ValueError("no axis {0} in a {1}-dimensional histogram".format(repr(axis), len(self._axes)))
+        return axis
+
+    def _fromall(self, axes, contents, variances):
+        out = _histogramtype(len(axes)).__new__(_histogramtype(len(axes)))
+        for n, axis in zip(("_fXaxis", "_fYaxis", "_fZaxis"), axes):
+            setattr(out, n, axis)
+        for n in ("_fName", "_fTitle"):
+            if hasattr(self, n):
+                setattr(out, n, getattr(self, n))
+        code = _typecodes.get(contents.dtype.str[1:], b"D")
+        if code == b"D":
+            contents = contents.astype(numpy.float64)
+        out._classname = "TH{0}".format(len(axes)).encode("ascii") + code
+        out._setarrays(contents.T.reshape(-1), variances.T.reshape(-1))
+        return out
+
+    def _regroup(self, newedges):
+        contents, variances = self.allvalues, self.allvariances
+        axes = list(self._axes)
+        for i, edges in enumerate(newedges):
+            if edges is not None:
+                edges, starts = _starts(binning(axes[i]).edges, edges)
+                contents = numpy.add.reduceat(contents, starts, axis=i, dtype=contents.dtype)
+                variances = numpy.add.reduceat(variances, starts, axis=i)
+                axes[i] = TAxis.from_edges(edges)
+        return self._fromall(axes, contents, variances)
+
+    def rebin(self, *binnings):
+        # one integer factor or array of new edges (a subset of the old ones) per axis, None to leave an axis as it is
+        if len(binnings) > len(self._axes):
+            raise ValueError("{0}-dimensional histogram rebinned along {1} axes".format(len(self._axes), len(binnings)))
+        newedges = []
+        for axis, x in zip(self._axes, binnings):
+            if x is None or not _isnumber(x):
+                newedges.append(x)
+            else:
+                if x != int(x) or x < 1:
+                    raise ValueError("rebinning factor must be a positive integer, not {0}".format(x))
+                edges = binning(axis).edges
+                newedges.append(edges[::int(x)])
+        out = self._regroup(newedges)
+        for n, x in self.__dict__.items():
+            if n == "_fEntries" or n.startswith("_fTsumw"):
+                setattr(out, n, x)
+        return out
+
+    def slice(self, *ranges):
+        # one (low, high) per axis, None to leave an axis as it is; keeps the whole bins that cover [low, high]
+        if len(ranges) > len(self._axes):
+            raise ValueError("{0}-dimensional histogram sliced along {1} axes".format(len(self._axes), len(ranges)))
+        newedges = []
+        for axis, x in zip(self._axes, ranges):
+            if x is None:
+                newedges.append(None)
+            else:
+                edges = binning(axis).edges
+                low, high = x
+                first = max(numpy.searchsorted(edges, low, side="right") - 1, 0)
+                last = min(numpy.searchsorted(edges, high, side="left"), len(edges) - 1)
+                newedges.append(edges[first:last + 1])
+        out = self._regroup(newedges)
+        out._resetstats()
+        return out
+
+    def project(self, axes):
+        # keeps the given axes (e.g. "x", "zy", (0, 2)) in that order, summing over all bins, flow included, of the others
+        keep = [self._axisindex(x) for x in axes]
+        if len(set(keep)) != len(keep) or len(keep) == 0:
+            raise ValueError("project needs distinct axes to keep, not {0}".format(repr(axes)))
+        drop = tuple(i for i in range(len(self._axes)) if i not in keep)
+        order = [sorted(keep).index(i) for i in keep]
+        contents = self.allvalues
+        contents = contents.sum(axis=drop, dtype=contents.dtype).transpose(order)
+        variances = numpy.asarray(self.allvariances).sum(axis=drop).transpose(order)
+        out = self._fromall([self._axes[i] for i in keep], contents, variances)
+        out._resetstats()
+        return out
+
+def _lookupflat(histogram, coordinates, errors, overflow):
+    coordinates = numpy.broadcast_arrays(*[numpy.asarray(x, dtype=numpy.float64) for x in coordinates])
+    shape = coordinates[0].shape
+    coordinates = [x.reshape(-1) for x in coordinates]
+
+    allshape = tuple(x._fNbins + 2 for x in histogram._axes)
+    indexes = [findbins(axis, x) for axis, x in zip(histogram._axes, coordinates)]
+    if overflow == "clamp":
+        indexes = [numpy.clip(i, 1, n - 2) for i, n in zip(indexes, allshape)]
+    index = numpy.ravel_multi_index(indexes, allshape, order="F")
+
+    if isinstance(histogram, ArrayBacked):
+        contents = histogram._fArray
+    else:
+        contents = numpy.asarray(histogram)
+    values = contents[index].reshape(shape)
+    if errors:
+        return values, numpy.sqrt(histogram._contentsvariances()[1][index]).reshape(shape)
+    else:
+        return values
+
+def lookup(histogram, coordinates, errors=False, overflow="clamp"):
+    """Returns the contents (and errors) of the bins at the coordinates; overflow="clamp" reads out-of-range coordinates from the nearest in-range bin, "overflow" from the flow bins."""
+    if overflow not in ("clamp", "overflow"):
+        raise ValueError("overflow must be \"clamp\" or \"overflow\", not {0}".format(repr(overflow)))
+    coordinates = [x.array if isinstance(x, awkward0.VirtualArray) else x for x in coordinates]
+
+    chunked = [x for x in coordinates if isinstance(x, awkward0.ChunkedArray)]
+    if len(chunked) > 0:
+        results, start = [], 0
+        for i, chunk in enumerate(chunked[0].chunks):
+            stop = start + len(chunk)
+            pieces = [x.chunks[i] if isinstance(x, awkward0.ChunkedArray) else x if numpy.ndim(x) == 0 else x[start:stop] for x in coordinates]
+            results.append(lookup(histogram, pieces, errors, overflow))
+            start = stop
+        if errors:
+            return tuple(awkward0.ChunkedArray([x[i] for x in results], [len(x[i]) for x in results]) for i in range(2))
+        else:
+            return awkward0.ChunkedArray(results, [len(x) for x in results])
+
+    jagged = [x for x in coordinates if isinstance(x, awkward0.JaggedArray)]
+    if len(jagged) > 0:
+        counts = jagged[0].counts
+        if len(jagged) != len(coordinates) or any(not numpy.array_equal(x.counts, counts) for x in jagged[1:]):
+            raise ValueError("jagged coordinates must all be jagged, with the same number of entries per event")
+        out = _lookupflat(histogram, [x.flatten() for x in coordinates], errors, overflow)
+        if errors:
+            return tuple(awkward0.JaggedArray.fromcounts(counts, x) for x in out)
+        else:
+            return awkward0.JaggedArray.fromcounts(counts, out)
+
+    if all(numpy.ndim(x) == 0 for x in coordinates):
+        out = _lookupflat(histogram, [numpy.reshape(x, 1) for x in coordinates], errors, overflow)
+        if errors:
+            return out[0][0], out[1][0]
+        else:
+            return out[0]
+    return _lookupflat(histogram, coordinates, errors, overflow)
+
+class TAxis(object):
+    def __init__(self, fNbins, fXmin, fXmax, fXbins=None):
+        self._fNbins = fNbins
+        self._fXmin = fXmin
+        self._fXmax = fXmax
+        if fXbins is None:
+            self._fXbins = numpy.array([], dtype=">f8")
+        else:
+            self._fXbins = fXbins
+        self._fLabels = None
+
+    def __getstate__(self):
+        return dict((n, x) for n, x in self.__dict__.items() if not n.startswith("_memo_"))
+
+    @classmethod
+    def from_edges(cls, edges):
+        # regular binning is stored as (fNbins, fXmin, fXmax) alone, like ROOT
+        if numpy.array_equal(edges, numpy.linspace(edges[0], edges[-1], len(edges), dtype=edges.dtype)):
+            return cls(len(edges) - 1, edges[0], edges[-1])
+        else:
+            return cls(len(edges) - 1, edges[0], edges[-1], edges.astype(">f8"))
+
+class ListBacked(object):
+    # deserialized ROOT histograms are lists of bin contents (including underflow and overflow): allvalues and
+    # allvariances convert them once, to read-only views that are kept until the list is assigned to or
+    # _fSumw2 is replaced (changes made inside _fSumw2 in place are not seen)
+
+    @property
+    def _allshape(self):
+        # ROOT's bin order: x varies fastest
+        return tuple(x._fNbins + 2 for x in self._axes)
+
+    def _listview(self, name, source, dtype):
+        cached = self.__dict__.get("_memo_" + name)
+        if cached is None or cached[0] is not source:
+            array = numpy.array(source, dtype=dtype)
+            cached = (source, _readonly(array.reshape(self._allshape[::-1]).T))
+            self.__dict__["_memo_" + name] = cached
+        return cached[1]
+
+    @property
+    def allvalues(self):
+        return self._listview("allvalues", self, getattr(self, "_dtype", numpy.dtype(numpy.float64)).newbyteorder("="))
+
+    @property
+    def allvariances(self):
+        sumw2 = getattr(self, "_fSumw2", [])
+        return self._listview("allvariances", self if len(sumw2) != len(self) else sumw2, numpy.float64)
+
+    def __setitem__(self, where, what):
+        self.__dict__.pop("_memo_allvalues", None)
+        self.__dict__.pop("_memo_allvariances", None)
+        super(ListBacked, self).__setitem__(where, what)
+
+    def __getstate__(self):
+        return dict((n, x) for n, x in self.__dict__.items() if not n.startswith("_memo_"))
+
+class ArrayBacked(object):
+    # bin contents (including underflow and overflow) live in the NumPy array self._fArray;
+    # the list interface of deserialized ROOT histograms is emulated on top of it (they are not lists),
+    # and allvalues/values and allvariances/variances are writable views of _fArray and _fSumw2
+
+    def _setarrays(self, contents, sumw2=None):
+        self._fArray = numpy.ascontiguousarray(contents, dtype=contents.dtype.newbyteorder("="))
+        self._dtype = self._fArray.dtype
+        if sumw2 is None:
+            self._fSumw2 = numpy.array([], dtype=numpy.float64)
+        else:
+            self._fSumw2 = numpy.array(sumw2, dtype=numpy.float64)
+
+    def _allview(self, name, array):
+        # cached per backing buffer: the view follows in-place changes to it, and writes to the view change it
+        cached = self.__dict__.get("_memo_" + name)
+        if cached is None or cached[0] is not array:
+            cached = (array, array.reshape(self._allshape[::-1]).T)
+            self.__dict__["_memo_" + name] = cached
+        return cached[1]
+
+    @property
+    def allvalues(self):
+        return self._allview("allvalues", self._fArray)
+
+    @property
+    def allvariances(self):
+        if len(self._fSumw2) != len(self._fArray):
+            # without a _fSumw2, the variances are a copy of the contents
+            return self._fArray.astype(numpy.float64).reshape(self._allshape[::-1]).T
+        else:
+            return self._allview("allvariances", self._fSumw2)
+
+    def _fill(self, coordinates, weight, executor=None):
+        if weight is not None:
+            if self._fArray.dtype.kind != "f":
+                # weighted entries are not integers: promote the contents (and class) to double precision
+                self._setarrays(self._fArray.astype(numpy.float64), self._fSumw2 if len(self._fSumw2) > 0 else None)
+                self._classname = self._classname[:-1] + b"D"
+            if len(self._fSumw2) != len(self._fArray):
+                self._fSumw2 = self._fArray.astype(numpy.float64)
+
+        if executor is None:
+            executor = uproot3_methods.common.parallel.executor
+
+        # the statistics of each wave of blocks are summed pairwise, in block order, and then added to the
+        # histogram, with or without an executor, so that they do not depend on it (nor do integer-weighted contents)
+        blocks = _fillblocks(coordinates, weight)
+        empty = None if executor is None else self._emptypartial()
+        while True:
+            wave = list(itertools.islice(blocks, fillwave))
+            if len(wave) == 0:
+                break
+            if executor is None:
+                _addstats(self, uproot3_methods.common.reduction.treereduce([self._fillblock(block, w) for block, w in wave], _sumstats))
+            else:
+                # each block fills a private partial histogram, and the partials are merged the same way
+                futures = [executor.submit(_fillpartial, empty, block, w) for block, w in wave]
+                _addpartials(self, uproot3_methods.common.reduction.treereduce([x.result() for x in futures], _addpartials))
+
+    def _emptypartial(self):
+        out = type(self).__new__(type(self))
+        for n, x in self.__dict__.items():
+            if n.startswith("_f") and n.endswith("axis"):
+                setattr(out, n, x)
+        out._classname = self._classname
+        out._setarrays(numpy.zeros_like(self._fArray), numpy.zeros_like(self._fSumw2))
+        return out
+
+    def _fillblock(self, block, w):
+        # fills the contents and returns the block's statistics
+        shape = self._allshape
+        indexes = [findbins(axis, x) for axis, x in zip(self._axes, block)]
+        index = numpy.ravel_multi_index(indexes, shape, order="F")
+        if w is None:
+            counts = numpy.bincount(index, minlength=len(self._fArray))
+            self._fArray += counts.astype(self._fArray.dtype, copy=False)
+            if len(self._fSumw2) == len(self._fArray):
+                self._fSumw2 += counts
+        else:
+            self._fArray += numpy.bincount(index, w, minlength=len(self._fArray))
+            self._fSumw2 += numpy.bincount(index, w*w, minlength=len(self._fArray))
+
+        # like ROOT, the statistics only count entries inside the axis ranges
+        inrange = None
+        for i, n in zip(indexes, shape):
+            ok = (i > 0) & (i < n - 1)
+            inrange = ok if inrange is None else (inrange & ok)
+        out = self._fillstats([x[inrange] for x in block], None if w is None else w[inrange])
+        out["_fEntries"] = len(index)
+        return out
+
+    def _fillstats(self, block, w):
+        names = "xyz"[:len(block)]
+        if w is None:
+            sumw = sumw2 = len(block[0])
+            wx = block
+        else:
+            sumw, sumw2 = w.sum(), (w*w).sum()
+            wx = [w*x for x in block]
+        out = {"_fTsumw": sumw, "_fTsumw2": sumw2}
+        for i, n in enumerate(names):
+            out["_fTsumw" + n] = wx[i].sum()
+            out["_fTsumw" + n + "2"] = wx[i].dot(block[i])
+            for j in range(i + 1, len(names)):
+                out["_fTsumw" + n + names[j]] = wx[i].dot(block[j])
+        return out
+
+    def copyvalues(self, flow=True, order="C"):
+        return numpy.array(self.allvalues if flow else self.values, order=order)
+
+    def copyvariances(self, flow=True, order="C"):
+        return numpy.array(self.allvariances if flow else self.variances, order=order)
+
+    def __getstate__(self):
+        return dict((n, x) for n, x in self.__dict__.items() if not n.startswith("_memo_"))
+
+    def __len__(self):
+        return len(self._fArray)
+
+    def __getitem__(self, where):
+        if isinstance(where, slice):
+            return self._fArray[where].tolist()
+        else:
+            return self._fArray[where]
+
+    def __setitem__(self, where, what):
+        self._fArray[where] = what
+
+    def __iter__(self):
+        return iter(self._fArray.tolist())
+
+    def __contains__(self, what):
+        return what in self._fArray
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self._fArray
+        else:
+            return self._fArray.astype(dtype, copy=False)
+
+    def index(self, what):
+        return self._fArray.tolist().index(what)
+
+    def count(self, what):
+        return int((self._fArray == what).sum())
+
+    def tolist(self):
+        return self._fArray.tolist()
+
+class Variations(object):
+    # N histograms with the binning of a template histogram, filled together: bin indices are found once
+    # per block and all N weights are accumulated with one bincount into an (N, numbins with flow) buffer,
+    # each row in ROOT's bin order (x varies fastest); subclasses name the histogram type and the axes
+
+    def __init__(self, template, numvariations):
+        for name in self._axisnames:
+            setattr(self, name, getattr(template, name))
+        self._fTitle = getattr(template, "_fTitle", b"")
+        length = int(numpy.prod(self._allshape))
+        self._fArray = numpy.zeros((numvariations, length), dtype=numpy.float64)
+        self._fSumw2 = numpy.zeros((numvariations, length), dtype=numpy.float64)
+        self._fEntries = 0
+        for name in self._statnames:
+            setattr(self, name, numpy.zeros(numvariations, dtype=numpy.float64))
+
+    @property
+    def _axes(self):
+        return tuple(getattr(self, x) for x in self._axisnames)
+
+    @property
+    def _allshape(self):
+        return tuple(x._fNbins + 2 for x in self._axes)
+
+    @property
+    def _statnames(self):
+        names = "xyz"[:len(self._axisnames)]
+        out = ["_fTsumw", "_fTsumw2"]
+        for i, n in enumerate(names):
+            out.extend(["_fTsumw" + n, "_fTsumw" + n + "2"] + ["_fTsumw" + n + m for m in names[i + 1:]])
+        return out
+
+    def __len__(self):
+        return len(self._fArray)
+
+    def _peraxis(self, name):
+        out = tuple(getattr(binning(x), name) for x in self._axes)
+        return out[0] if len(out) == 1 else out
+
+    @property
+    def edges(self):
+        return self._peraxis("edges")
+
+    @property
+    def alledges(self):
+        return self._peraxis("alledges")
+
+    def _view(self, array):
+        # (N, x, y, z) from rows in which x varies fastest
+        shape = self._allshape
+        return _readonly(array.reshape((len(array),) + shape[::-1]).transpose((0,) + tuple(range(len(shape), 0, -1))))
+
+    @property
+    def values(self):
+        return self.allvalues[(slice(None),) + (slice(1, -1),)*len(self._axisnames)]
+
+    @property
+    def allvalues(self):
+        return self._view(self._fArray)
+
+    @property
+    def variances(self):
+        return self.allvariances[(slice(None),) + (slice(1, -1),)*len(self._axisnames)]
+
+    @property
+    def allvariances(self):
+        return self._view(self._fSumw2)
+
+    def numpy(self):
+        return self.values, self.edges
+
+    def allnumpy(self):
+        return self.allvalues, self.alledges
+
+    def _regular(self, weights):
+        # weights given as one N-vector per event (NanoAOD's LHEScaleWeight, LHEPdfWeight) become an (events, N) array
+        if isinstance(weights, awkward0.VirtualArray):
+            weights = weights.array
+        if isinstance(weights, awkward0.ChunkedArray):
+            return awkward0.ChunkedArray([self._regular(x) for x in weights.chunks], weights.chunksizes)
+        if isinstance(weights, awkward0.JaggedArray):
+            if not (weights.counts == len(self)).all():
+                raise ValueError("every event must have {0} weights".format(len(self)))
+            weights = weights.flatten().reshape(-1, len(self))
+        weights = numpy.asarray(weights, dtype=numpy.float64)
+        if weights.ndim != 2 or weights.shape[1] != len(self):
+            raise ValueError("weights must have shape (entries or events, {0})".format(len(self)))
+        return weights
+
+    def _fill(self, coordinates, weights):
+        for block, w in _fillblocks(coordinates, self._regular(weights), (len(self),)):
+            self._fillblock(block, w)
+
+    def _fill_bootstrap(self, coordinates, eventnumbers, seed, weight):
+        # replica weights are Poisson(1), drawn from a counter-based generator keyed by (seed, event number, replica),
+        # so they do not depend on how the events are chunked or distributed
+        blocks = _fillblocks(coordinates, eventnumbers)
+        if weight is None:
+            for block, events in blocks:
+                self._fillblock(block, poisson1(seed, events, len(self)))
+        else:
+            for (block, events), (_, w) in zip(blocks, _fillblocks(coordinates, weight)):
+                self._fillblock(block, poisson1(seed, events, len(self)) * numpy.asarray(w, dtype=numpy.float64)[:, numpy.newaxis])
+
+    def _fillblock(self, block, w):
+        numvariations, length = self._fArray.shape
+        shape = self._allshape
+        indexes = [findbins(axis, x) for axis, x in zip(self._axes, block)]
+        index = numpy.ravel_multi_index(indexes, shape, order="F")
+        flat = (index[:, numpy.newaxis] + numpy.arange(numvariations) * length).reshape(-1)
+        self._fArray += numpy.bincount(flat, w.reshape(-1), minlength=self._fArray.size).reshape(self._fArray.shape)
+        self._fSumw2 += numpy.bincount(flat, (w*w).reshape(-1), minlength=self._fArray.size).reshape(self._fArray.shape)
+        self._fEntries += len(index)
+
+        inrange = None
+        for i, n in zip(indexes, shape):
+            ok = (i > 0) & (i < n - 1)
+            inrange = ok if inrange is None else (inrange & ok)
+        block, w = [x[inrange] for x in block], w[inrange]
+        names = "xyz"[:len(block)]
+        self._fTsumw += w.sum(axis=0)
+        self._fTsumw2 += (w*w).sum(axis=0)
+        for i, n in enumerate(names):
+            getattr(self, "_fTsumw" + n)[:] += block[i].dot(w)
+            getattr(self, "_fTsumw" + n + "2")[:] += (block[i]*block[i]).dot(w)
+            for j in range(i + 1, len(names)):
+                getattr(self, "_fTsumw" + n + names[j])[:] += (block[i]*block[j]).dot(w)
+
+    def histogram(self, i):
+        out = self._histogramtype.__new__(self._histogramtype)
+        for name in self._axisnames:
+            setattr(out, name, getattr(self, name))
+        out._fTitle = self._fTitle
+        out._classname = self._histogramtype.__name__.encode() + b"D"
+        out._setarrays(self._fArray[i].copy(), self._fSumw2[i])
+        out._fEntries = self._fEntries
+        for name in self._statnames:
+            setattr(out, name, getattr(self, name)[i])
+        return out
+
+    def histograms(self):
+        return [self.histogram(i) for i in range(len(self))]
@@ -6,7 +6,13 @@ import math
 import numbers
 import operator
 
+import uproot3_methods.common.approx
+import uproot3_methods.common.kernels
+import uproot3_methods.common.parallel
+
 class Common(object):
+    __slots__ = ()
+
     @property
     def mag2(self):
         return self.dot(self)
@@ -45,21 +51,67 @@ class Common(object):
     def __ge__(self, other):
         raise TypeError("spatial vectors have no natural ordering")
 
+def _isscale(numpy, x):
+    return isinstance(x, (numbers.Number, numpy.number)) or (isinstance(x, numpy.ndarray) and x.dtype.kind in "biuf")
+
+def _scalefactor(self, ufunc, method, inputs):
+    # the factor of (vector * number), (number * vector), (vector / number), -vector or +vector on a flat array, else None
+    if method != "__call__" or isinstance(self, self.awkward0.JaggedArray):
+        return None
+    if len(inputs) == 1 and inputs[0] is self:
+        if ufunc is self.awkward0.numpy.negative:
+            return -1.0
+        elif ufunc is self.awkward0.numpy.positive:
+            return 1.0
+    if len(inputs) != 2:
+        return None
+    if ufunc is self.awkward0.numpy.multiply:
+        if inputs[0] is self and _isscale(self.awkward0.numpy, inputs[1]):
+            return inputs[1]
+        if inputs[1] is self and _isscale(self.awkward0.numpy, inputs[0]):
+            return inputs[0]
+    elif ufunc is self.awkward0.numpy.divide or ufunc is self.awkward0.numpy.true_divide:
+        if inputs[0] is self and _isscale(self.awkward0.numpy, inputs[1]):
+            return 1.0 / self.awkward0.numpy.asarray(inputs[1], dtype=self.awkward0.numpy.float64)
+    return None
+
+def _cartesianufunc(self, ufunc, method, inputs, kwargs):
+    # any other ufunc on a non-Cartesian array: |v| directly, else the same ufunc on Cartesian copies of the vector operands
+    if ufunc is self.awkward0.numpy.absolute and method == "__call__" and "out" not in kwargs:
+        return self.mag
+    return getattr(ufunc, method)(*[x._to_cartesian() if isinstance(x, ArrayMethods) else x for x in inputs], **kwargs)
+
+def _flipphi(numpy, phi, flip):
+    # phi + pi where flip, wrapped back into [-pi, pi)
+    return numpy.where(flip, (phi + 2*math.pi) % (2*math.pi) - math.pi, phi)
+
 class ArrayMethods(Common):
     @property
+    @uproot3_methods.common.parallel.chunkwise
     def unit(self):
         return self / self.mag
 
     @property
+    @uproot3_methods.common.parallel.chunkwise
     def rho(self):
         out = self.rho2
         return self.awkward0.numpy.sqrt(out)
 
     @property
+    @uproot3_methods.common.parallel.chunkwise
     def phi(self):
+        if uproot3_methods.common.approx.enabled:
+            return self._trymemo("approx_phi", lambda self: uproot3_methods.common.approx.phi(self.x, self.y))
         return self.awkward0.numpy.arctan2(self.y, self.x)
 
+    @uproot3_methods.common.parallel.chunkwise
     def cosdelta(self, other):
+        mine = [getattr(self, x) for x in self._components]
+        theirs = [getattr(other, x) for x in self._components]
+        out = uproot3_methods.common.kernels.cosdelta(mine, theirs)
+        if out is not None:
+            return out
+
         denom = self.mag2 * other.mag2
         mask = (denom > 0)
         denom = denom[mask]
@@ -73,6 +125,7 @@ class ArrayMethods(Common):
 
         return self.awkward0.numpy.clip(out, -1, 1)
 
+    @uproot3_methods.common.parallel.chunkwise
     def angle(self, other, normal=None, degrees=False):
         out = self.awkward0.numpy.arccos(self.cosdelta(other))
         if normal is not None:
@@ -84,28 +137,18 @@ class ArrayMethods(Common):
         return out
 
     def isopposite(self, other, tolerance=1e-10):
-        tmp = self + other
-        tmp.x = self.awkward0.numpy.absolute(tmp.x)
-        tmp.y = self.awkward0.numpy.absolute(tmp.y)
-        tmp.z = self.awkward0.numpy.absolute(tmp.z)
-
-        out = (tmp.x < tolerance)
-        out = self.awkward0.numpy.bitwise_and(out, tmp.y < tolerance)
-        out = self.awkward0.numpy.bitwise_and(out, tmp.z < tolerance)
+        out = None
+        for x in self._components:
+            close = self.awkward0.numpy.absolute(getattr(self, x) + getattr(other, x)) < tolerance
+            out = close if out is None else self.awkward0.numpy.bitwise_and(out, close)
         return out
 
     def isperpendicular(self, other, tolerance=1e-10):
-        tmp = self.dot(other)
-        tmp.x = self.awkward0.numpy.absolute(tmp.x)
-        tmp.y = self.awkward0.numpy.absolute(tmp.y)
-        tmp.z = self.awkward0.numpy.absolute(tmp.z)
-
-        out = (tmp.x < tolerance)
-        out = self.awkward0.numpy.bitwise_and(out, tmp.y < tolerance)
-        out = self.awkward0.numpy.bitwise_and(out, tmp.z < tolerance)
-        return out
+        return self.awkward0.numpy.absolute(self.dot(other)) < tolerance
 
 class Methods(Common):
+    __slots__ = ()
+
     @property
     def unit(self):
         return self / self.mag
@@ -133,12 +176,10 @@ class Methods(Common):
         return out
 
     def isopposite(self, other, tolerance=1e-10):
-        tmp = self + other
-        return abs(tmp.x) < tolerance and abs(tmp.y) < tolerance and abs(tmp.z) < tolerance
+        return all(abs(getattr(self, x) + getattr(other, x)) < tolerance for x in self._components)
 
     def isperpendicular(self, other, tolerance=1e-10):
-        tmp = self.dot(other)
-        return abs(tmp.x) < tolerance and abs(tmp.y) < tolerance and abs(tmp.z) < tolerance
+        return abs(self.dot(other)) < tolerance
 
     def __add__(self, other):
         return self._vector(operator.add, other)
@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot3-methods/blob/master/LICENSE
+
+import math
+import os
+import threading
+
+import numpy
+
+import awkward0
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# compiled kernels are opt-in (each kernel is JIT-compiled on its first call): set enabled = True,
+# use the compiled() context manager, or set UPROOT3_METHODS_NUMBA=1 in the environment (like
+# approx.enabled and parallel.executor, this is process-wide: do not change it while other threads compute)
+enabled = (numba is not None and os.environ.get("UPROOT3_METHODS_NUMBA", "0") not in ("", "0"))
+
+class compiled(object):
+    def __init__(self, flag=True):
+        if flag and numba is None:
+            raise ImportError("install numba to use compiled kernels:\n\n    pip install numba\n")
+        self.flag = flag
+
+    def __enter__(self):
+        global enabled
+        self.previous = enabled
+        enabled = self.flag
+        return self
+
+    def __exit__(self, type, value, traceback):
+        global enabled
+        enabled = self.previous
+
+if numba is None:
+    prange = range
+else:
+    prange = numba.prange
+
+def _jit(function):
+    if numba is None:
+        return function
+    parallel = numba.njit(parallel=True, nogil=True)(function)
+    serial = numba.njit(nogil=True)(function)
+    def dispatch(*args):
+        # numba's threading layers must not be entered from several Python threads (e.g. a chunk executor) at once
+        if isinstance(threading.current_thread(), threading._MainThread):
+            return parallel(*args)
+        else:
+            return serial(*args)
+    return dispatch
+
+@_jit
+def _mass(x, y, z, t, out):
+    for i in prange(len(out)):
+        m2 = t[i]*t[i] - x[i]*x[i] - y[i]*y[i] - z[i]*z[i]
+        if m2 >= 0:
+            out[i] = math.sqrt(m2)
+        else:
+            out[i] = math.nan
+
+@_jit
+def _deltar(eta1, phi1, eta2, phi2, out):
+    for i in prange(len(out)):
+        deta = eta1[i] - eta2[i]
+        dphi = (phi1[i] - phi2[i] + math.pi) % (2*math.pi) - math.pi
+        out[i] = math.sqrt(deta*deta + dphi*dphi)
+
+@_jit
+def _boost(x, y, z, t, bx, by, bz, outx, outy, outz, outt):
+    for i in prange(len(outx)):
+        b2 = bx[i]*bx[i] + by[i]*by[i] + bz[i]*bz[i]
+        if b2 < 1:
+            gamma = 1.0 / math.sqrt(1 - b2)
+        else:
+            gamma = math.nan
+        if b2 != 0:
+            gamma2 = (gamma - 1) / b2
+        else:
+            gamma2 = 0.0
+        bp = x[i]*bx[i] + y[i]*by[i] + z[i]*bz[i]
+        outx[i] = x[i] + gamma2*bp*bx[i] + t[i]*gamma*bx[i]
+        outy[i] = y[i] + gamma2*bp*by[i] + t[i]*gamma*by[i]
+        outz[i] = z[i] + gamma2*bp*bz[i] + t[i]*gamma*bz[i]
+        outt[i] = gamma*(t[i] + bp)
+
+@_jit
+def _rotate(x, y, angle, outx, outy):
+    for i in prange(len(outx)):
+        c = math.cos(angle[i])
+        s = math.sin(angle[i])
+        outx[i] = x[i]*c - y[i]*s
+        outy[i] = x[i]*s + y[i]*c
+
+@_jit
+def _rotate_axis(x, y, z, ux, uy, uz, angle, outx, outy, outz):
+    for i in prange(len(outx)):
+        norm = math.sqrt(ux[i]*ux[i] + uy[i]*uy[i] + uz[i]*uz[i])
+        a = ux[i] / norm
+        b = uy[i] / norm
+        d = uz[i] / norm
+        c = math.cos(angle[i])
+        s = math.sin(angle[i])
+        c1 = 1 - c
+        outx[i] = (c + a*a*c1)*x[i] + (a*b*c1 - d*s)*y[i] + (a*d*c1 + b*s)*z[i]
+        outy[i] = (a*b*c1 + d*s)*x[i] + (c + b*b*c1)*y[i] + (b*d*c1 - a*s)*z[i]
+        outz[i] = (a*d*c1 - b*s)*x[i] + (b*d*c1 + a*s)*y[i] + (c + d*d*c1)*z[i]
+
+@_jit
+def _cosdelta(x1, y1, z1, x2, y2, z2, out):
+    for i in prange(len(out)):
+        mag2 = (x1[i]*x1[i] + y1[i]*y1[i] + z1[i]*z1[i]) * (x2[i]*x2[i] + y2[i]*y2[i] + z2[i]*z2[i])
+        if mag2 > 0:
+            out[i] = min(1.0, max(-1.0, (x1[i]*x2[i] + y1[i]*y2[i] + z1[i]*z2[i]) / math.sqrt(mag2)))
+        else:
+            out[i] = 1.0
+
+@_jit
+def _jaggedsum(starts, stops, content, out):
+    for i in prange(len(starts)):
+        total = 0.0
+        for j in range(starts[i], stops[i]):
+            total += content[j]
+        out[i] = total
+
+@_jit
+def _jaggedadd(starts, stops, content, events, sign, out):
+    for i in prange(len(starts)):
+        for j in range(starts[i], stops[i]):
+            out[j] = content[j] + sign*events[i]
+
+def _cosdeltanumpy(mine, theirs):
+    # dot product and both squared magnitudes accumulated in place; zero-length vectors give 1
+    dot = mine[0] * theirs[0]
+    mag2 = mine[0] * mine[0]
+    othermag2 = theirs[0] * theirs[0]
+    tmp = numpy.empty_like(dot)
+    for a, b in zip(mine[1:], theirs[1:]):
+        dot += numpy.multiply(a, b, out=tmp)
+        mag2 += numpy.multiply(a, a, out=tmp)
+        othermag2 += numpy.multiply(b, b, out=tmp)
+    mag2 *= othermag2
+    numpy.sqrt(mag2, out=mag2)
+    out = numpy.ones_like(dot)
+    numpy.divide(dot, mag2, out=out, where=(mag2 > 0))
+    return numpy.clip(out, -1, 1, out=out)
+
+def _numeric(x):
+    return isinstance(x, numpy.ndarray) and x.dtype.kind in "biuf"
+
+def _prepare(*arrays):
+    # flatten same-structure jagged arrays, broadcast scalars, and reject anything else (returns None)
+    wrap = lambda x: x
+    jagged = [x for x in arrays if isinstance(x, awkward0.JaggedArray)]
+    if len(jagged) > 0:
+        first = jagged[0]
+        if len(first.starts.shape) != 1 or not _numeric(first.content):
+            return None
+        counts = first.counts
+        for x in jagged[1:]:
+            if not _numeric(x.content) or not (x is first or numpy.array_equal(x.counts, counts)):
+                return None
+        wrap = lambda x: awkward0.JaggedArray.fromcounts(counts, x)
+        arrays = [x.flatten() if isinstance(x, awkward0.JaggedArray) else x for x in arrays]
+
+    length = None
+    for x in arrays:
+        if isinstance(x, numpy.ndarray) and x.shape != ():
+            if not _numeric(x) or len(x.shape) != 1 or (length is not None and len(x) != length):
+                return None
+            length = len(x)
+        elif not isinstance(x, (int, float, numpy.number, numpy.ndarray)):
+            return None
+    if length is None:
+        return None
+
+    out = []
+    for x in arrays:
+        x = numpy.asarray(x, dtype=numpy.float64)
+        if x.shape == ():
+            x = numpy.broadcast_to(x, (length,))
+        out.append(x)
+    return wrap, out
+
+def mass(x, y, z, t):
+    prepared = _prepare(x, y, z, t)
+    if prepared is None:
+        return None
+    wrap, (x, y, z, t) = prepared
+    out = numpy.empty(len(x), dtype=numpy.float64)
+    _mass(x, y, z, t, out)
+    return wrap(out)
+
+def delta_r(eta1, phi1, eta2, phi2):
+    prepared = _prepare(eta1, phi1, eta2, phi2)
+    if prepared is None:
+        return None
+    wrap, (eta1, phi1, eta2, phi2) = prepared
+    out = numpy.empty(len(eta1), dtype=numpy.float64)
+    _deltar(eta1, phi1, eta2, phi2, out)
+    return wrap(out)
+
+def boost(x, y, z, t, bx, by, bz):
+    prepared = _prepare(x, y, z, t, bx, by, bz)
+    if prepared is None:
+        return None
+    wrap, arrays = prepared
+    out = [numpy.empty(len(arrays[0]), dtype=numpy.float64) for i in range(4)]
+    _boost(*(arrays + out))
+    return tuple(wrap(o) for o in out)
+
+def rotate(x, y, angle):
+    prepared = _prepare(x, y, angle)
+    if prepared is None:
+        return None
+    wrap, arrays = prepared
+    out = [numpy.empty(len(arrays[0]), dtype=numpy.float64) for i in range(2)]
+    _rotate(*(arrays + out))
+    return tuple(wrap(o) for o in out)
+
+def rotate_axis(x, y, z, ux, uy, uz, angle):
+    prepared = _prepare(x, y, z, ux, uy, uz, angle)
+    if prepared is None:
+        return None
+    wrap, arrays = prepared
+    out = [numpy.empty(len(arrays[0]), dtype=numpy.float64) for i in range(3)]
+    _rotate_axis(*(arrays + out))
+    return tuple(wrap(o) for o in out)
+
+def cosdelta(first, second):
+    # first and second are the (x, y) or (x, y, z) components of two vectors (arrays); a compiled loop
+    # if enabled, otherwise fused NumPy operations on the flattened components
+    prepared = _prepare(*(list(first) + list(second)))
+    if prepared is None:
+        return None
+    wrap, arrays = prepared
+    mine, theirs = arrays[:len(first)], arrays[len(first):]
+    if not enabled:
+        return wrap(_cosdeltanumpy(mine, theirs))
+    if len(mine) == 2:
+        zeros = numpy.zeros(len(mine[0]), dtype=numpy.float64)
+        mine, theirs = mine + [zeros], theirs + [zeros]
+    out = numpy.empty(len(mine[0]), dtype=numpy.float64)
+    _cosdelta(*(mine + theirs + [out]))
+    return wrap(out)
+
+def jaggedsum(*components):
+    first = components[0]
+    if not all(isinstance(x, awkward0.JaggedArray) and len(x.starts.shape) == 1 and _numeric(x.content) for x in components):
+        return None
+    if not all(x is first or (numpy.array_equal(x.starts, first.starts) and numpy.array_equal(x.stops, first.stops)) for x in components):
+        return None
+    starts, stops = first.starts, first.stops
+    out = []
+    for x in components:
+        o = numpy.empty(len(starts), dtype=numpy.float64)
+        _jaggedsum(starts, stops, numpy.asarray(x.content, dtype=numpy.float64), o)
+        out.append(o)
+    return out
+
+def add(ufunc, a, b):
+    # jagged content plus/minus one value per event, broadcast through the offsets without a parents index
+    if len(getattr(a, "shape", ())) != 1 or len(getattr(b, "shape", ())) != 1:
+        return None
+    if ufunc is numpy.add:
+        sign = 1.0
+    elif ufunc is numpy.subtract:
+        sign = -1.0
+    else:
+        return None
+    if isinstance(b, awkward0.JaggedArray) and not isinstance(a, awkward0.JaggedArray):
+        if sign < 0:
+            return None
+        a, b = b, a
+    if not isinstance(a, awkward0.JaggedArray) or isinstance(b, awkward0.JaggedArray):
+        return None
+    if len(a.starts.shape) != 1 or not _numeric(a.content) or not _numeric(b) or len(b) != len(a):
+        return None
+
+    out = numpy.zeros(len(a.content), dtype=numpy.float64)
+    _jaggedadd(a.starts, a.stops, numpy.asarray(a.content, dtype=numpy.float64), numpy.asarray(b, dtype=numpy.float64), sign, out)
+    return a.copy(content=out)
+
+def apply(ufunc, inputs, kwargs):
+    if enabled and len(inputs) == 2 and len(kwargs) == 0:
+        out = add(ufunc, inputs[0], inputs[1])
+        if out is not None:
+            return out
+    return ufunc(*inputs, **kwargs)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot3-methods/blob/master/LICENSE
+
+import functools
+
+import numpy
+
+import awkward0
+
+# a concurrent.futures.Executor (e.g. ThreadPoolExecutor(32)); when set, operations on ChunkedArrays
+# of vectors evaluate their chunks concurrently (NumPy releases the GIL in most ufuncs)
+#
+# This and the other switches (approx.enabled, kernels.enabled) are process-wide, not per thread:
+# the chunks running on the executor's threads read them while they run, so set them, or enter
+# using(), approximate() and compiled(), before starting a computation, not while one is in flight
+# on another thread.
+executor = None
+
+class using(object):
+    def __init__(self, executor):
+        self.executor = executor
+
+    def __enter__(self):
+        global executor
+        self.previous = executor
+        executor = self.executor
+        return self.executor
+
+    def __exit__(self, type, value, traceback):
+        global executor
+        executor = self.previous
+
+def _materialize(chunk):
+    if isinstance(chunk, awkward0.VirtualArray):
+        return chunk.array
+    else:
+        return chunk
+
+def _split(array, x):
+    # one argument per chunk of array, or None if x is chunked differently
+    if isinstance(x, awkward0.ChunkedArray):
+        if not array._aligned(x):
+            return None
+        return [lambda chunk=chunk: _materialize(chunk) for chunk in x.chunks]
+    elif isinstance(x, (numpy.ndarray, awkward0.AwkwardArray)) and len(x.shape) > 0 and len(x) == len(array):
+        return [lambda slc=slc: x[slc] for slc in array._slices()]
+    else:
+        return [lambda: x for i in range(len(array.chunks))]
+
+def _call(function, chunk, args, kwargs):
+    return function(_materialize(chunk), *[x() for x in args], **dict((n, x()) for n, x in kwargs.items()))
+
+def chunkwise(function):
+    @functools.wraps(function)
+    def wrapped(self, *args, **kwargs):
+        if executor is None or not isinstance(self, awkward0.ChunkedArray) or len(self.chunks) < 2:
+            return function(self, *args, **kwargs)
+
+        splitargs = [_split(self, x) for x in args]
+        splitkwargs = dict((n, _split(self, x)) for n, x in kwargs.items())
+        if any(x is None for x in splitargs) or any(x is None for x in splitkwargs.values()):
+            return function(self, *args, **kwargs)
+
+        futures = [executor.submit(_call, function, chunk, [x[i] for x in splitargs], dict((n, x[i]) for n, x in splitkwargs.items())) for i, chunk in enumerate(self.chunks)]
+        chunks = [x.result() for x in futures]
+        return self.awkward0.Methods.maybemixin(type(chunks[0]), self.awkward0.ChunkedArray)(chunks, [len(x) for x in chunks])
+
+    return wrapped
+
+def map(function, items):
+    items = list(items)
+    if executor is None or len(items) < 2:
+        return [function(x) for x in items]
+    else:
+        return [x.result() for x in [executor.submit(function, x) for x in items]]
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot3-methods/blob/master/LICENSE
+
+import itertools
+import operator
+
+import numpy
+
+import awkward0
+
+def flatten(objects):
+    # a list of scalar vectors, or a list of lists of them (one per event): returns (counts or None, flat list)
+    objects = list(objects)
+    if any(isinstance(x, (list, tuple)) for x in objects):
+        counts = numpy.fromiter((len(x) for x in objects), dtype=numpy.int64, count=len(objects))
+        return counts, list(itertools.chain.from_iterable(objects))
+    else:
+        return None, objects
+
+def components(objects, names, counts=None):
+    # one pass over the objects, filling a single (len(objects), len(names)) buffer
+    getter = operator.attrgetter(*names)
+    buffer = numpy.fromiter(itertools.chain.from_iterable(map(getter, objects)), dtype=numpy.float64, count=len(objects)*len(names))
+    buffer = numpy.ascontiguousarray(buffer.reshape(len(objects), len(names)).T)
+    if counts is None:
+        return list(buffer)
+    else:
+        return [awkward0.JaggedArray.fromcounts(counts, x) for x in buffer]
+
+def fields(records, candidates, dtype=None, names=None):
+    # column views (no copy) of a structured array or of a record buffer interpreted with dtype
+    if dtype is not None:
+        records = numpy.frombuffer(records, dtype=dtype)
+    elif not isinstance(records, numpy.ndarray):
+        raise TypeError("records must be a NumPy structured array, or a buffer with a dtype")
+    if records.dtype.names is None:
+        raise TypeError("records must have named fields, not dtype {0}".format(records.dtype))
+
+    if names is not None:
+        names = tuple(names)
+        if len(names) != len(candidates[0]):
+            raise ValueError("expected {0} field names, not {1}".format(len(candidates[0]), names))
+    else:
+        for candidate in candidates:
+            if all(x in records.dtype.names for x in candidate):
+                names = candidate
+                break
+        else:
+            raise ValueError("none of the field names {0} found in records with fields {1}; pass names explicitly".format(", ".join(repr(x) for x in candidates), records.dtype.names))
+
+    return names, [records[x] for x in names]
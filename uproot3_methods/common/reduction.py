@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot3-methods/blob/master/LICENSE
+
+import operator
+
+import numpy
+
+import awkward0
+
+import uproot3_methods.common.kernels
+import uproot3_methods.common.parallel
+
+# number of elements (flat) or events (jagged) summed together in one block
+blocksize = 1048576
+
+def treereduce(partials, combine=operator.add):
+    # pairwise, in order: fewer sequential steps and smaller rounding errors than a running total
+    partials = list(partials)
+    if len(partials) == 0:
+        raise ValueError("nothing to reduce")
+    while len(partials) > 1:
+        partials = [combine(partials[i], partials[i + 1]) if i + 1 < len(partials) else partials[i] for i in range(0, len(partials), 2)]
+    return partials[0]
+
+def _blocks(length):
+    return [(start, min(start + blocksize, length)) for start in range(0, length, blocksize)]
+
+def _flatsums(components):
+    # one (numcomponents,) partial sum per block, each component reduced directly (no stacked copy)
+    length = len(components[0])
+    def partial(block):
+        start, stop = block
+        return numpy.array([x[start:stop].sum() for x in components])
+    blocks = _blocks(length)
+    if len(blocks) == 0:
+        return numpy.array([x[:0].sum() for x in components])
+    return treereduce(uproot3_methods.common.parallel.map(partial, blocks))
+
+def _jaggedsums(offsets, components):
+    # (numcomponents, numevents) per-event sums; offsets need not start at zero, but must describe contiguous content
+    numevents = len(offsets) - 1
+    dtype = numpy.result_type(*components)
+    def partial(block):
+        start, stop = block
+        starts = offsets[start:stop]
+        out = numpy.zeros((len(components), stop - start), dtype=dtype)
+        nonempty = (offsets[start + 1:stop + 1] > starts)
+        if nonempty.any():
+            # reduceat's last segment runs to the end of its input, so each input stops at this block's last entry
+            indices = starts[nonempty] - offsets[start]
+            for x, o in zip(components, out):
+                o[nonempty] = numpy.add.reduceat(x[offsets[start]:offsets[stop]], indices)
+        return out
+    blocks = _blocks(numevents)
+    if len(blocks) == 0:
+        return numpy.zeros((len(components), 0), dtype=dtype)
+    return numpy.concatenate(uproot3_methods.common.parallel.map(partial, blocks), axis=1)
+
+def componentsums(array, components):
+    """Returns (jagged, sums): per-event sums of the named components (one array each) if jagged, else global sums."""
+    if isinstance(array, awkward0.VirtualArray):
+        array = array.array
+
+    if isinstance(array, awkward0.ChunkedArray) and len(array.chunks) > 0:
+        partials = uproot3_methods.common.parallel.map(lambda chunk: componentsums(chunk, components), array.chunks)
+        if partials[0][0]:
+            return True, tuple(numpy.concatenate([x[1][i] for x in partials]) for i in range(len(components)))
+        else:
+            return False, tuple(treereduce(numpy.array(x[1]) for x in partials).tolist())
+
+    elif isinstance(array, awkward0.JaggedArray) and not isinstance(array.content, (awkward0.JaggedArray, awkward0.ChunkedArray)):
+        if uproot3_methods.common.kernels.enabled:
+            sums = uproot3_methods.common.kernels.jaggedsum(*[getattr(array, x) for x in components])
+            if sums is not None:
+                return True, tuple(sums)
+        array = array.compact()
+        return True, tuple(_jaggedsums(array.offsets, [numpy.asarray(getattr(array.content, x)) for x in components]))
+
+    elif isinstance(array, awkward0.JaggedArray):
+        return True, tuple(getattr(array, x).sum() for x in components)
+
+    else:
+        return False, tuple(_flatsums([numpy.asarray(getattr(array, x)) for x in components]).tolist())
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot3-methods/blob/master/LICENSE
+
+import numbers
+
+import numpy
+
+import awkward0
+
+def _unwrap(constituents):
+    # constituents must be jagged (jets → constituents), possibly inside any number of jagged levels (events → jets)
+    if not isinstance(constituents, awkward0.JaggedArray):
+        raise TypeError("constituents must be a jagged array of Lorentz vectors (one subarray per jet)")
+    if isinstance(constituents.content, awkward0.JaggedArray):
+        wrap, jets = _unwrap(constituents.flatten())
+        counts = constituents.counts
+        return lambda x: awkward0.JaggedArray.fromcounts(counts, wrap(x)), jets
+    else:
+        return lambda x: x, constituents
+
+def _bymultiplicity(jets, fields, compute, numout):
+    # runs compute on (jets, multiplicity) arrays of the given fields for the jets of each multiplicity separately,
+    # so that the dense (jets, width, width) arrays are never padded to the widest jet of the batch
+    counts = jets.counts
+    starts = jets.counts2offsets(counts)[:-1]
+    flat = [numpy.asarray(getattr(jets, field).flatten(), dtype=numpy.float64) for field in fields]
+
+    outs = [numpy.zeros(len(jets), dtype=numpy.float64) for i in range(numout)]
+    order = numpy.argsort(counts, kind="mergesort")
+    sortedcounts = counts[order]
+    splits = numpy.nonzero(sortedcounts[1:] != sortedcounts[:-1])[0] + 1
+    for group in numpy.split(order, splits):
+        if len(group) > 0:
+            index = starts[group][:, None] + numpy.arange(counts[group[0]])
+            for out, result in zip(outs, compute(*[x[index] for x in flat])):
+                out[group] = result
+    return outs
+
+def _deltar2(eta1, phi1, eta2, phi2):
+    dphi = (phi1 - phi2 + numpy.pi) % (2*numpy.pi) - numpy.pi
+    return (eta1 - eta2)**2 + dphi**2
+
+def _tau(pt, eta, phi, mask, axeta, axphi, axmask, beta, R0):
+    # distances from every constituent (axis 1) to every candidate axis (axis 2); inactive axes never win
+    dr2 = _deltar2(eta[:, :, None], phi[:, :, None], axeta[:, None, :], axphi[:, None, :])
+    dr2[~numpy.broadcast_to(axmask[:, None, :], dr2.shape)] = numpy.inf
+    mindr = numpy.sqrt(dr2.min(axis=2))**beta
+    mindr[~mask] = 0
+
+    d0 = pt.sum(axis=1) * R0**beta
+    out = (pt * mindr).sum(axis=1)
+    numpy.divide(out, d0, out=out, where=(d0 > 0))
+    return out
+
+def _ktdistances(pt, eta, phi, active, rows, cols):
+    # exclusive-kt distance min(pt_i², pt_k²) ΔR_ik² between pseudojets (rows, cols) and all pseudojets of the same jet
+    pt2 = pt[rows]**2
+    out = numpy.minimum(pt2[numpy.arange(len(rows)), cols][:, None], pt2)
+    out *= _deltar2(eta[rows, cols][:, None], phi[rows, cols][:, None], eta[rows], phi[rows])
+    out[~active[rows]] = numpy.inf
+    out[numpy.arange(len(rows)), cols] = numpy.inf
+    return out
+
+def _nsubjettiness(pt, eta, phi, px, py, pz, E, Ns, beta, R0):
+    numjets, width = pt.shape
+    mask = numpy.ones((numjets, width), dtype=numpy.bool_)
+
+    taus = [numpy.zeros(numjets, dtype=numpy.float64) for n in Ns]
+
+    # pseudojets start as the constituents and are merged in place, pairwise, by the exclusive-kt rule
+    axpt, axeta, axphi = pt.copy(), eta.copy(), phi.copy()
+    active = mask.copy()
+    numactive = numpy.full(numjets, width, dtype=numpy.int64)
+
+    distances = numpy.full((numjets, width, width), numpy.inf)
+    for i in range(width):
+        rows = numpy.nonzero(mask[:, i])[0]
+        distances[rows, i, :] = _ktdistances(axpt, axeta, axphi, active, rows, numpy.full(len(rows), i))
+
+    while True:
+        for n, tau in zip(Ns, taus):
+            ready = (numactive == n)
+            if ready.any():
+                tau[ready] = _tau(pt[ready], eta[ready], phi[ready], mask[ready], axeta[ready], axphi[ready], active[ready], beta, R0)
+
+        rows = numpy.nonzero(numactive > Ns[0])[0]
+        if len(rows) == 0:
+            break
+
+        best = distances[rows].reshape(len(rows), -1).argmin(axis=1)
+        i, j = best // width, best % width
+
+        for x in (px, py, pz, E):
+            x[rows, i] += x[rows, j]
+        active[rows, j] = False
+        numactive[rows] -= 1
+
+        mx, my, mz = px[rows, i], py[rows, i], pz[rows, i]
+        mpt = numpy.sqrt(mx**2 + my**2)
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            axeta[rows, i] = numpy.arcsinh(mz / mpt)
+        axpt[rows, i] = mpt
+        axphi[rows, i] = numpy.arctan2(my, mx)
+
+        distances[rows, j, :] = numpy.inf
+        distances[rows, :, j] = numpy.inf
+        update = _ktdistances(axpt, axeta, axphi, active, rows, i)
+        distances[rows, i, :] = update
+        distances[rows, :, i] = update
+
+    return taus
+
+def nsubjettiness(constituents, N, beta=1.0, R0=0.8):
+    if isinstance(N, (numbers.Integral, numpy.integer)):
+        return nsubjettiness(constituents, (N,), beta=beta, R0=R0)[0]
+    Ns = sorted(set(int(n) for n in N))
+    if len(Ns) == 0 or Ns[0] < 1:
+        raise ValueError("N must be positive")
+
+    wrap, jets = _unwrap(constituents)
+    compute = lambda pt, eta, phi, px, py, pz, E: _nsubjettiness(pt, eta, phi, px, py, pz, E, Ns, beta, R0)
+    taus = dict(zip(Ns, _bymultiplicity(jets, ("pt", "eta", "phi", "x", "y", "z", "t"), compute, len(Ns))))
+    return tuple(wrap(taus[int(n)]) for n in N)
+
+def _ecfsdense(pt, eta, phi, beta):
+    total = pt.sum(axis=1)
+    z = numpy.zeros_like(pt)
+    numpy.divide(pt, total[:, None], out=z, where=(total[:, None] > 0))
+
+    R = numpy.sqrt(_deltar2(eta[:, :, None], phi[:, :, None], eta[:, None, :], phi[:, None, :]))**beta
+
+    e2 = 0.5 * numpy.einsum("ri,rij,rj->r", z, R, z)
+
+    # Σ_{i,j,k} z_i z_j z_k R_ij R_ik R_jk counts each distinct triplet 3! times
+    A = R * z[:, None, :]
+    e3 = (z * (numpy.matmul(A, R) * A).sum(axis=2)).sum(axis=1) / 6.0
+
+    return e2, e3
+
+def _ecfs(constituents, beta):
+    wrap, jets = _unwrap(constituents)
+    e2, e3 = _bymultiplicity(jets, ("pt", "eta", "phi"), lambda pt, eta, phi: _ecfsdense(pt, eta, phi, beta), 2)
+    return wrap, e2, e3
+
+def ecf(constituents, N, beta=1.0):
+    if N not in (1, 2, 3):
+        raise ValueError("energy correlation functions are implemented for N = 1, 2, 3")
+    wrap, e2, e3 = _ecfs(constituents, beta)
+    if N == 1:
+        return wrap(numpy.ones_like(e2))
+    elif N == 2:
+        return wrap(e2)
+    else:
+        return wrap(e3)
+
+def c2(constituents, beta=1.0):
+    wrap, e2, e3 = _ecfs(constituents, beta)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        return wrap(e3 / e2**2)
+
+def d2(constituents, beta=1.0):
+    wrap, e2, e3 = _ecfs(constituents, beta)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        return wrap(e3 / e2**3)